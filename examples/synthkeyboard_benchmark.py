@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 Cooper Dalrymple
+#
+# SPDX-License-Identifier: Unlicense
+
+import asyncio
+import time
+
+from synthkeyboard import Keyboard, Sequencer
+
+ROUNDS = 50
+COUNTS = (1, 4, 16, 32)
+TOLERANCE = 2.0
+
+# Each timer and keyboard must have its own note buffers
+events = ([], [])
+first, second = Sequencer(bpm=600.0), Sequencer(bpm=600.0)
+for sequencer, log in zip((first, second), events):
+    sequencer.gate = 1.0
+    for position in range(sequencer.length):
+        sequencer.set_note(position, 60)
+    sequencer.on_press = lambda notenum, velocity, log=log: log.append(("press", notenum))
+    sequencer.on_release = lambda notenum, log=log: log.append(("release", notenum))
+    sequencer.active = True
+
+
+async def step_first() -> None:
+    # Only the first sequencer is stepped while both are active, then both are stopped
+    task = asyncio.create_task(first.update())
+    await asyncio.sleep(0.1)
+    second.active = False
+    first.active = False
+    task.cancel()
+
+
+asyncio.run(step_first())
+assert events[0], "Sequencer did not step"
+assert not events[1], "Timer state is shared"
+
+first, second = Keyboard(max_voices=4), Keyboard(max_voices=4)
+first.append(60)
+assert not second.notes and not second.active_voices, "Keyboard state is shared"
+
+
+def benchmark(count: int) -> float:
+    keyboards = [Keyboard(max_voices=4) for _ in range(count)]
+    for keyboard in keyboards:
+        keyboard.on_voice_press = lambda voice: None
+        keyboard.on_voice_release = lambda voice: None
+
+    start = time.monotonic_ns()
+    for _ in range(ROUNDS):
+        for keyboard in keyboards:
+            for notenum in (60, 64, 67, 72):
+                keyboard.append(notenum)
+            for notenum in (60, 64, 67, 72):
+                keyboard.remove(notenum)
+    return (time.monotonic_ns() - start) / count / ROUNDS
+
+
+# The cost per keyboard should stay flat as the number of keyboards grows
+results = [(count, benchmark(count)) for count in COUNTS]
+for count, cost in results:
+    print(f"{count:d} keyboards: {cost / 1000:.1f}us per keyboard")
+
+costs = [cost for count, cost in results]
+ratio = max(costs) / min(costs)
+print("PASS" if ratio < TOLERANCE else "FAIL", f"({ratio:.2f}x)")
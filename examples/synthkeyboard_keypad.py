@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2024 Cooper Dalrymple
+#
+# SPDX-License-Identifier: Unlicense
+
+import asyncio
+
+import board
+import keypad
+
+from synthkeyboard import Keyboard, KeypadKeyScanner
+
+keyboard = Keyboard(
+    keys=KeypadKeyScanner(
+        keypad.Keys((board.GP0, board.GP1, board.GP2, board.GP3), value_when_pressed=False)
+    ),
+    max_voices=4,
+)
+
+keyboard.on_voice_press = lambda voice: print(f"Pressed: {voice.note.notenum:d}")
+keyboard.on_voice_release = lambda voice: print(f"Released: {voice.note.notenum:d}")
+
+asyncio.run(keyboard.update())
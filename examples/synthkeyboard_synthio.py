@@ -3,16 +3,11 @@
 #
 # SPDX-License-Identifier: Unlicense
 
-import adafruit_midi
 import audiopwmio
 import board
 import digitalio
 import synthio
 import usb_midi
-from adafruit_midi.control_change import ControlChange
-from adafruit_midi.note_off import NoteOff
-from adafruit_midi.note_on import NoteOn
-from adafruit_midi.pitch_bend import PitchBend
 
 import synthkeyboard
 
@@ -44,22 +39,18 @@ def release(voice):
         led.value = False
 keyboard.on_voice_release = release
 
-midi = adafruit_midi.MIDI(
-    midi_in=usb_midi.ports[0], in_channel=0, midi_out=usb_midi.ports[1], out_channel=0
-)
+midi = synthkeyboard.MidiParser(keyboard, channel=0)
 
-while True:
-    msg = midi.receive()
-    if isinstance(msg, NoteOn) and msg.velocity != 0:
-        keyboard.append(msg.note, msg.velocity / 127.0)
-    elif isinstance(msg, NoteOff) or (isinstance(msg, NoteOn) and msg.velocity == 0):
-        keyboard.remove(msg.note)
-    elif isinstance(msg, ControlChange):
-        if msg.control == 1: # Mod Wheel
-            for note in notes:
-                note.bend.a.scale = msg.value / 127 / 12.0
-        elif msg.control == 64: # Sustain Pedal
-            keyboard.sustain = msg.value >= 64
-    elif isinstance(msg, PitchBend):
+def control_change(control, value):
+    if control == 1: # Mod Wheel
         for note in notes:
-            note.bend.b = (msg.pitch_bend / 8192) - 1.0
+            note.bend.a.scale = value / 127 / 12.0
+midi.on_control_change = control_change
+
+def pitch_bend(value):
+    for note in notes:
+        note.bend.b = (value / 8192) - 1.0
+midi.on_pitch_bend = pitch_bend
+
+while True:
+    midi.read(usb_midi.ports[0])
@@ -28,7 +28,9 @@ __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/dcooperdalrymple/CircuitPython_SynthKeyboard.git"
 
 import asyncio
+import math
 import random
+import struct
 import time
 from micropython import const
 
@@ -105,6 +107,368 @@ class DebouncerKey(Key):
             return KeyState.NONE
 
 
+_VELOCITY_STEPS = const(32)
+
+
+class VelocityKey(Key):
+    """A key with two contacts, such as those found on velocity-sensitive keybeds. The time between
+    the first and second contacts closing is measured with nanosecond timestamps and converted to a
+    velocity using a precomputed lookup table, so that the key can be polled quickly within a scan
+    loop. The key is released once both contacts have opened.
+
+    :param first: The input pin or arbitrary predicate of the contact which closes first.
+    :param second: The input pin or arbitrary predicate of the contact which closes last.
+    :param clock: A function which returns the current time in nanoseconds. Defaults to
+        :func:`time.monotonic_ns`.
+    """
+
+    def __init__(
+        self,
+        first: ROValueIO | Callable[[], bool],
+        second: ROValueIO | Callable[[], bool],
+        clock: Callable[[], int] = None,
+    ):
+        self._first = first if callable(first) else lambda: first.value
+        self._second = second if callable(second) else lambda: second.value
+        self._clock = clock if clock is not None else time.monotonic_ns
+        self._start = None
+        self._pressed = False
+        self._velocity = 1.0
+        self._min_time = 2_000_000
+        self._max_time = 50_000_000
+        self._table = [1.0] * _VELOCITY_STEPS
+        self._update_step()
+        self.velocity_curve = VelocityCurve.LINEAR
+
+    def _update_step(self) -> None:
+        self._step = max((self._max_time - self._min_time) // (_VELOCITY_STEPS - 1), 1)
+
+    @property
+    def velocity_curve(self) -> int | tuple[float]:
+        """The curve used to map the time between contacts to velocity. Use one of the constants of
+        :class:`VelocityCurve` or a custom sequence of at least 2 velocities (0.0-1.0) which will be
+        interpolated evenly across the full range of velocity. The lookup table of the key is only
+        rebuilt when the curve is set. Defaults to :const:`VelocityCurve.LINEAR`.
+        """
+        return self._velocity_curve
+
+    @velocity_curve.setter
+    def velocity_curve(self, value: int | tuple[float]) -> None:
+        table = _compile_velocity_curve(value)
+        for i in range(_VELOCITY_STEPS):
+            velocity = 1.0 - i * (126 / 127) / (_VELOCITY_STEPS - 1)
+            self._table[i] = velocity if table is None else _map_velocity(table, velocity)
+        self._velocity_curve = value
+
+    @property
+    def min_time(self) -> float:
+        """The time in seconds between contacts which results in the maximum velocity of 1.0.
+        Defaults to 0.002s.
+        """
+        return self._min_time / 1_000_000_000
+
+    @min_time.setter
+    def min_time(self, value: float) -> None:
+        self._min_time = int(value * 1_000_000_000)
+        self._update_step()
+
+    @property
+    def max_time(self) -> float:
+        """The time in seconds between contacts which results in the minimum velocity of 1/127.
+        Defaults to 0.05s.
+        """
+        return self._max_time / 1_000_000_000
+
+    @max_time.setter
+    def max_time(self, value: float) -> None:
+        self._max_time = int(value * 1_000_000_000)
+        self._update_step()
+
+    @property
+    def state(self) -> int:
+        """The current state as a constant value of :class:`KeyState`. When accessed, both contacts
+        will be read and the velocity of the key will be calculated when it is pressed.
+        """
+        first, second = self._first(), self._second()
+        if self._pressed:
+            if first or second:
+                return KeyState.NONE
+            self._pressed = False
+            self._start = None
+            return KeyState.RELEASE
+
+        if not first:
+            self._start = None
+        elif self._start is None:
+            self._start = self._clock()
+
+        if not second:
+            return KeyState.NONE
+        index = 0
+        if self._start is not None:
+            index = min(
+                max((self._clock() - self._start - self._min_time) // self._step, 0),
+                _VELOCITY_STEPS - 1,
+            )
+        self._velocity = self._table[index]
+        self._pressed = True
+        return KeyState.PRESS
+
+    @property
+    def velocity(self) -> float:
+        """The velocity (0.0-1.0) measured when the key was last pressed."""
+        return self._velocity
+
+
+class KeyScanner:
+    """An abstract layer to read the state of many keys in a single operation to interface with the
+    :class:`Keyboard` class. The state of all keys is stored as a packed bitmask, and each scan is
+    compared against the previous state so that only the keys which have changed are reported.
+    Child classes must implement the :meth:`_read` method.
+
+    :param count: The number of keys which are read by the scanner.
+    """
+
+    def __init__(self, count: int):
+        self._count = count
+        self._state = 0
+        self._changed = 0
+        self._pending = 0
+        self._polled = (1 << count) - 1
+        self._keys = None
+
+    @property
+    def count(self) -> int:
+        """The number of keys which are read by the scanner."""
+        return self._count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def state(self) -> int:
+        """The current state of all keys as a bitmask. Bit n is set if key n is pressed."""
+        return self._state
+
+    def pressed(self, keynum: int) -> bool:
+        """Whether or not a key was pressed during the most recent scan.
+
+        :param keynum: The index of the key.
+        """
+        return bool(self._state & (1 << keynum))
+
+    def velocity(self, keynum: int) -> float:
+        """Get the current velocity of a key (0.0-1.0).
+
+        :param keynum: The index of the key.
+        """
+        return 1.0
+
+    def _read(self) -> int:
+        return 0
+
+    @property
+    def keys(self) -> tuple[Key]:
+        """A :class:`Key` object for each key of the scanner so that it can be used in place of
+        individual keys. A new scan is performed when a key is polled for a second time, so the
+        keys can be polled in any order with only one scan per pass.
+        """
+        if self._keys is None:
+            self._keys = tuple(ScannerKey(self, i) for i in range(self._count))
+        return self._keys
+
+    def scan(self) -> int:
+        """Read the state of all keys and compare it to the previous scan.
+
+        :return: a bitmask of the keys which have changed state
+        """
+        state = self._read()
+        self._changed = state ^ self._state
+        self._state = state
+        self._pending |= self._changed
+        self._polled = 0
+        return self._changed
+
+    def _poll(self, keynum: int) -> int:
+        bit = 1 << keynum
+        if self._polled & bit:
+            self.scan()
+        self._polled |= bit
+        if not self._pending & bit:
+            return KeyState.NONE
+        self._pending &= ~bit
+        return KeyState.PRESS if self._state & bit else KeyState.RELEASE
+
+    def changes(self):
+        """Scan all keys and iterate over each key which has changed state since the previous scan
+        as a tuple of the key index and a :class:`KeyState` constant, ie: :code:`(keynum, state)`.
+        """
+        changed = self.scan()
+        keynum = 0
+        while changed:
+            if changed & 1:
+                yield (
+                    keynum,
+                    KeyState.PRESS if self._state & (1 << keynum) else KeyState.RELEASE,
+                )
+            changed >>= 1
+            keynum += 1
+
+
+class ScannerKey(Key):
+    """A single key of a :class:`KeyScanner` object which can be used with the :class:`Key`
+    interface. These objects are created by :attr:`KeyScanner.keys`.
+
+    :param scanner: The :class:`KeyScanner` object which reads this key.
+    :param keynum: The index of the key within the scanner.
+    """
+
+    def __init__(self, scanner: KeyScanner, keynum: int):
+        self._scanner = scanner
+        self._keynum = keynum
+
+    @property
+    def state(self) -> int:
+        """The state of the key since it was last polled as a constant value of
+        :class:`KeyState`.
+        """
+        return self._scanner._poll(self._keynum)
+
+    @property
+    def velocity(self) -> float:
+        """Get the current velocity (0.0-1.0)."""
+        return self._scanner.velocity(self._keynum)
+
+
+class BitmaskKeyScanner(KeyScanner):
+    """Read all keys at once from a function which returns a packed bitmask of their states, such
+    as a chain of shift registers or a port read. Bit n of the value corresponds to key n.
+
+    :param count: The number of keys in the bitmask.
+    :param read: A function which returns the state of all keys as an integer bitmask.
+    :param inverted: Whether or not to invert the state of the inputs. When invert is `False`, the
+        signals are active-high. When it is `True`, the signals are active-low.
+    """
+
+    def __init__(self, count: int, read: Callable[[], int], inverted: bool = False):
+        KeyScanner.__init__(self, count)
+        self._read_bitmask = read
+        self._mask = (1 << count) - 1
+        self._inverted = inverted
+
+    def _read(self) -> int:
+        state = self._read_bitmask() & self._mask
+        return state ^ self._mask if self._inverted else state
+
+
+class KeypadKeyScanner(KeyScanner):
+    """Read keys using the event queue of a :mod:`keypad` object such as :class:`keypad.Keys`,
+    :class:`keypad.KeyMatrix`, or :class:`keypad.ShiftRegisterKeys`. The scanning and debouncing of
+    the keys is handled in the background by :mod:`keypad`, and queued events are applied to the
+    state bitmask during each scan without allocating new event objects.
+
+    :param keys: The :mod:`keypad` object which will be used to read the keys.
+    """
+
+    def __init__(self, keys):
+        import keypad
+
+        KeyScanner.__init__(self, keys.key_count)
+        self._keypad = keys
+        self._event = keypad.Event()
+
+    def _read(self) -> int:
+        state = self._state
+        while self._keypad.events.get_into(self._event):
+            if self._event.pressed:
+                state |= 1 << self._event.key_number
+            else:
+                state &= ~(1 << self._event.key_number)
+        return state
+
+
+class MatrixKeyScanner(KeyScanner):
+    """Scan a matrix of keys arranged in rows and columns in a single pass. The index of each key is
+    calculated as :code:`row * columns + column`. Debouncing is performed on the packed bitmask of
+    all keys by requiring a number of consecutive scans to agree before a key changes state.
+
+    :param rows: The number of rows in the matrix.
+    :param columns: The number of columns in the matrix.
+    :param read: A function which selects a row of the matrix and returns the state of each column
+        within that row as a bitmask, ie: :code:`def read(row):`.
+    :param debounce: The number of consecutive scans which must agree before a key changes state.
+        The minimum value allowed is 1, which disables debouncing.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        columns: int,
+        read: Callable[[int], int],
+        debounce: int = 2,
+    ):
+        KeyScanner.__init__(self, rows * columns)
+        self._rows = rows
+        self._columns = columns
+        self._read_row = read
+        self._column_mask = (1 << columns) - 1
+        self._samples = [0] * max(debounce, 1)
+        self._sample = 0
+        self._anti_ghosting = True
+
+    @property
+    def anti_ghosting(self) -> bool:
+        """Whether or not to suppress ghost keys. In a key matrix without diodes, pressing three
+        keys on the corners of a rectangle causes the fourth key to appear pressed. When enabled,
+        keys which could be ghosts will not be pressed until the ambiguity is resolved, but keys
+        which are already pressed are unaffected. Disable this option if the matrix has diodes.
+        Defaults to `True`.
+        """
+        return self._anti_ghosting
+
+    @anti_ghosting.setter
+    def anti_ghosting(self, value: bool) -> None:
+        self._anti_ghosting = value
+
+    @property
+    def rows(self) -> int:
+        """The number of rows in the matrix."""
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        """The number of columns in the matrix."""
+        return self._columns
+
+    def _ghosts(self, raw: int) -> int:
+        # Find all keys within rows which share two or more pressed columns
+        ghosts = 0
+        for i in range(self._rows - 1):
+            columns = (raw >> (i * self._columns)) & self._column_mask
+            if not columns & (columns - 1):
+                continue
+            for j in range(i + 1, self._rows):
+                common = columns & (raw >> (j * self._columns))
+                if common & (common - 1):
+                    ghosts |= (common << (i * self._columns)) | (common << (j * self._columns))
+        return ghosts
+
+    def _read(self) -> int:
+        raw = 0
+        for row in range(self._rows):
+            raw |= (self._read_row(row) & self._column_mask) << (row * self._columns)
+        if self._anti_ghosting:
+            raw &= ~(self._ghosts(raw) & ~self._state)
+
+        self._samples[self._sample] = raw
+        self._sample = (self._sample + 1) % len(self._samples)
+        high, low = raw, ~raw
+        for sample in self._samples:
+            high &= sample
+            low &= ~sample
+        return (self._state & ~low) | high
+
+
 class Note:
     """Object which represents the parameters of a note. Contains note number, velocity, key number
     (if evoked by a :class:`Key` object), and timestamp of when the note was created.
@@ -115,21 +479,29 @@ class Note:
         object.
     """
 
+    __slots__ = ("notenum", "velocity", "keynum", "timestamp")
+
     def __init__(self, notenum: int, velocity: float = 1.0, keynum: int = None):
         self.notenum = notenum
         self.velocity = velocity
         self.keynum = keynum
         self.timestamp = time.monotonic()
 
-    notenum: int = None
+    notenum: int
     """The MIDI note number representing the frequency of a note."""
 
-    velocity: float = 1.0
+    velocity: float
     """The strength of which a note was pressed from 0.0 to 1.0."""
 
-    keynum: int = None
+    keynum: int
     """The index number of the :class:`Key` object which created this :class:`Note` object."""
 
+    timestamp: float | int
+    """The time in seconds at which this :class:`Note` object was created. When
+    :attr:`Keyboard.fixed_point` is enabled, this is instead an integer tick of the keyboard's event
+    counter.
+    """
+
     @property
     def data(self) -> tuple[int, float, int]:
         """Return all note data as tuple. The data is formatted as: (notenum:int, velocity:float,
@@ -138,62 +510,55 @@ class Note:
         return (self.notenum, self.velocity, self.keynum)
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
+        if type(other) is int:
+            return self.notenum == other
+        elif isinstance(other, Note):
             return self.notenum == other.notenum
         elif isinstance(other, Voice):
-            return self.notenum == other.note.notenum if not other.note is None else False
-        elif type(other) == int:
-            return self.notenum == other
-        elif type(other) == list:
+            return self.notenum == other._note.notenum if other._note is not None else False
+        elif type(other) is list:
             for i in other:
                 if self.__eq__(i):
                     return True
         return False
 
     def __ne__(self, other):
-        if isinstance(other, self.__class__):
-            return self.notenum != other.notenum
-        elif isinstance(other, Voice):
-            return self.notenum != other.note.notenum if not other.note is None else True
-        elif type(other) == int:
+        if type(other) is int:
             return self.notenum != other
-        elif type(other) == list:
-            for i in other:
-                if not self.__ne__(i):
-                    return False
-            return True
+        elif isinstance(other, (Note, Voice)) or type(other) is list:
+            return not self.__eq__(other)
         else:
             return False
 
     def __lt__(self, other):
-        if isinstance(other, self.__class__):
-            return self.notenum < other.notenum
-        elif type(other) == int:
+        if type(other) is int:
             return self.notenum < other
+        elif isinstance(other, Note):
+            return self.notenum < other.notenum
         else:
             return False
 
     def __gt__(self, other):
-        if isinstance(other, self.__class__):
-            return self.notenum > other.notenum
-        elif type(other) == int:
+        if type(other) is int:
             return self.notenum > other
+        elif isinstance(other, Note):
+            return self.notenum > other.notenum
         else:
             return False
 
     def __le__(self, other):
-        if isinstance(other, self.__class__):
-            return self.notenum <= other.notenum
-        elif type(other) == int:
+        if type(other) is int:
             return self.notenum <= other
+        elif isinstance(other, Note):
+            return self.notenum <= other.notenum
         else:
             return False
 
     def __ge__(self, other):
-        if isinstance(other, self.__class__):
-            return self.notenum >= other.notenum
-        elif type(other) == int:
+        if type(other) is int:
             return self.notenum >= other
+        elif isinstance(other, Note):
+            return self.notenum >= other.notenum
         else:
             return False
 
@@ -206,17 +571,21 @@ class Voice:
     :param index: The position of the voice in the pre-defined set of keyboard voices.
     """
 
+    __slots__ = ("index", "time", "_note")
+
     def __init__(self, index: int):
         self.index = index
         self.time = time.monotonic()
+        self._note = None
 
-    index: int = None
+    index: int
     """The position of the voice in the pre-defined set of keyboard voices."""
 
-    time: float = None
-    """The last time in seconds at which a note was registered with this voice."""
-
-    _note: Note = None
+    time: float | int
+    """The last time in seconds at which a note was registered with this voice. When
+    :attr:`Keyboard.fixed_point` is enabled, this is instead an integer tick of the keyboard's event
+    counter.
+    """
 
     @property
     def note(self) -> Note:
@@ -236,29 +605,165 @@ class Voice:
         """The active state of the voice. Will return `True` if a note has been assigned to this
         voice.
         """
-        return not self.note is None
+        return not self._note is None
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            return self.index == other.index
-        elif isinstance(other, Note) or type(other) == list:
-            return self.note == other
-        elif type(other) is int:
+        if type(other) is int:
             return self.index == other  # NOTE: Use index or notenum?
+        elif isinstance(other, Voice):
+            return self.index == other.index
+        elif isinstance(other, Note) or type(other) is list:
+            return self._note == other
         else:
             return False
 
     def __ne__(self, other):
-        if isinstance(other, self.__class__):
-            return self.index != other.index
-        elif isinstance(other, Note) or type(other) == list:
-            return self.note != other
-        elif type(other) is int:
+        if type(other) is int:
             return self.index != other  # NOTE: Use index or notenum?
+        elif isinstance(other, Voice):
+            return self.index != other.index
+        elif isinstance(other, Note) or type(other) is list:
+            return self._note != other
         else:
             return False
 
 
+class NotePool:
+    """A fixed-size collection of reusable :class:`Note` objects. Notes acquired from the pool are
+    recycled once they are released rather than being discarded, which avoids memory allocation
+    (and the resulting garbage collection) while notes are being played. If the pool has been
+    exhausted, new :class:`Note` objects will be allocated as needed.
+
+    :param size: The number of :class:`Note` objects to preallocate.
+    """
+
+    def __init__(self, size: int):
+        self._notes = []
+        self.size = size
+
+    _size: int = 0
+
+    @property
+    def size(self) -> int:
+        """The maximum number of unused :class:`Note` objects held by the pool. When increased, the
+        additional :class:`Note` objects will be preallocated immediately.
+        """
+        return self._size
+
+    @size.setter
+    def size(self, value: int) -> None:
+        self._size = max(value, 0)
+        if len(self._notes) > self._size:
+            del self._notes[self._size :]
+        else:
+            for i in range(self._size - len(self._notes)):
+                self._notes.append(Note(0))
+
+    @property
+    def available(self) -> int:
+        """The number of unused :class:`Note` objects currently held by the pool."""
+        return len(self._notes)
+
+    def acquire(
+        self, notenum: int, velocity: float = 1.0, keynum: int = None, timestamp: float | int = None
+    ) -> Note:
+        """Get a :class:`Note` object from the pool with the provided parameters. If no unused
+        objects are available, a new :class:`Note` object will be allocated.
+
+        :param notenum: The MIDI note number representing the frequency of a note.
+        :param velocity: The strength of which a note was pressed from 0.0 to 1.0.
+        :param keynum: The index number of the :class:`Key` object which created this note.
+        :param timestamp: The timestamp of the note. Defaults to the current value of
+            :func:`time.monotonic`.
+        """
+        if not self._notes:
+            note = Note(notenum, velocity, keynum)
+        else:
+            note = self._notes.pop()
+            note.notenum = notenum
+            note.velocity = velocity
+            note.keynum = keynum
+        note.timestamp = timestamp if timestamp is not None else time.monotonic()
+        return note
+
+    def release(self, note: Note) -> None:
+        """Return a :class:`Note` object to the pool so that it can be reused by :meth:`acquire`.
+        The note must not be referenced elsewhere after it has been released.
+
+        :param note: The :class:`Note` object to recycle.
+        """
+        if len(self._notes) < self._size:
+            self._notes.append(note)
+
+
+class VelocityCurve:
+    """An enum-like class representing the curves which can be used to map the velocity of incoming
+    notes.
+    """
+
+    LINEAR: int = const(0)
+    """Velocity is unaltered."""
+
+    EXPONENTIAL: int = const(1)
+    """Velocity increases slowly at first and more rapidly as the note is pressed harder."""
+
+    LOGARITHMIC: int = const(2)
+    """Velocity increases rapidly at first and more slowly as the note is pressed harder."""
+
+
+_VELOCITY_TABLE_SIZE = const(128)
+
+
+def _compile_velocity_curve(curve: int | tuple[float], bits: int = 0) -> list[float] | list[int]:
+    # Compile a velocity curve into a 128-entry lookup table, custom tables are linearly resampled
+    # and fixed-point tables are scaled to the full range of the integer
+    if curve == VelocityCurve.LINEAR:
+        return None
+    table = [0.0] * _VELOCITY_TABLE_SIZE
+    for i in range(_VELOCITY_TABLE_SIZE):
+        x = i / (_VELOCITY_TABLE_SIZE - 1)
+        if curve == VelocityCurve.EXPONENTIAL:
+            table[i] = (math.pow(10.0, x) - 1.0) / 9.0
+        elif curve == VelocityCurve.LOGARITHMIC:
+            table[i] = math.log(1.0 + 9.0 * x) / math.log(10.0)
+        else:
+            x *= len(curve) - 1
+            j = min(int(x), len(curve) - 2)
+            table[i] = curve[j] + (curve[j + 1] - curve[j]) * (x - j)
+        if bits:
+            table[i] = int(table[i] * ((1 << bits) - 1) + 0.5)
+    return table
+
+
+def _map_velocity(table: list[float], velocity: float) -> float:
+    return table[
+        min(max(int(velocity * (_VELOCITY_TABLE_SIZE - 1) + 0.5), 0), _VELOCITY_TABLE_SIZE - 1)
+    ]
+
+
+def _bisect_notes(notes: list[Note], notenum: int) -> int:
+    # Find the insertion point of a note value within a list of notes sorted by note value
+    lo, hi = 0, len(notes)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if notenum < notes[mid].notenum:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def _insert_note(notes: list[Note], note: Note) -> None:
+    notes.insert(_bisect_notes(notes, note.notenum), note)
+
+
+def _remove_note(notes: list[Note], note: Note) -> None:
+    i = _bisect_notes(notes, note.notenum) - 1
+    while notes[i] is not note:
+        i -= 1
+    del notes[i]
+
+
 class TimerStep:
     """An enum-like class representing common step divisions."""
 
@@ -287,6 +792,25 @@ class TimerStep:
     """Thirtysecond note beat division"""
 
 
+class TimerCatchUp:
+    """An enum-like class representing how a :class:`Timer` handles steps which were missed because
+    the event loop has fallen behind by one or more steps.
+    """
+
+    SKIP: int = const(0)
+    """Drop any missed steps and continue from the most recent step on the original timing grid."""
+
+    BURST: int = const(1)
+    """Trigger all missed steps as quickly as possible until the timer has caught up to the
+    original timing grid.
+    """
+
+    STRETCH: int = const(2)
+    """Shift the timing grid by the amount that the timer has fallen behind so that the late step
+    becomes the new reference point for all following steps.
+    """
+
+
 class Timer:
     """An abstract class to help handle timing functionality of the :class:`Arpeggiator` and
     :class:`Sequencer` classes. Note press and release timing is managed by bpm (beats per minute),
@@ -300,29 +824,42 @@ class Timer:
     """
 
     def __init__(self, bpm: float = 120.0, steps: float = TimerStep.EIGHTH, gate: float = 0.5):
+        self._last_press = []
+        self._enabled = asyncio.Event()
         self._reset(False)
+        self.reset_stats()
         self.gate = gate
         self.bpm = bpm
         self.steps = steps
 
+    _step_time: float = 0.25
+    _gate_duration: float = 0.125
+
     def _update_timing(self) -> None:
+        # Shift the timing grid origin so that any change applies from the current step
+        step_time = self._step_time
         self._step_time = 60.0 / self._bpm / self._steps
+        self._origin += self._tick * (step_time - self._step_time)
         self._gate_duration = self._gate * self._step_time
 
     def _reset(self, immediate=True):
-        self._now = time.monotonic()
-        if immediate:
-            self._now -= self._step_time
+        self._origin = time.monotonic()
+        self._tick = 0 if immediate else 1
 
     _bpm: float = 120.0
 
     @property
     def bpm(self) -> float:
-        """Beats per minute."""
+        """Beats per minute. If the timer has been added to a :class:`Clock`, the tempo of the
+        clock and all of its timers will be changed.
+        """
         return self._bpm
 
     @bpm.setter
     def bpm(self, value: float) -> None:
+        if self._clock is not None:
+            self._clock.bpm = value
+            return
         self._bpm = max(value, 1.0)
         self._update_timing()
 
@@ -339,6 +876,8 @@ class Timer:
     def steps(self, value: float) -> None:
         self._steps = max(value, TimerStep.WHOLE)
         self._update_timing()
+        if self._clock is not None:
+            self._clock._update_resolution()
 
     _gate: float = 0.5
 
@@ -367,12 +906,19 @@ class Timer:
             return
         self._active = value
         if self._active:
-            self._now = time.monotonic() - self._step_time
+            self._origin = time.monotonic()
+            self._tick = 0
+            self._start()
+            self._enabled.set()
         else:
+            self._enabled.clear()
             self._do_release()
         if self.on_enabled:
             self.on_enabled(self._active)
 
+    def _start(self) -> None:
+        pass
+
     on_enabled: Callable[[bool], None] = None
     """The callback method that is called when :attr:`active` is changed. Must have 1 parameter for
     the current active state. Ie: :code:`def enabled(active):`
@@ -394,29 +940,135 @@ class Timer:
     for note value. Velocity is always assumed to be 0.0. Ie: :code:`def release(notenum):`.
     """
 
-    _last_press: list[int] = []
+    _catch_up: int = TimerCatchUp.BURST
+
+    @property
+    def catch_up(self) -> int:
+        """How steps are handled when the event loop has fallen behind by one or more steps. Use
+        one of the constants of :class:`TimerCatchUp`. Defaults to :const:`TimerCatchUp.BURST`.
+        """
+        return self._catch_up
+
+    @catch_up.setter
+    def catch_up(self, value: int) -> None:
+        self._catch_up = value % 3
+
+    @property
+    def lateness(self) -> float:
+        """The amount of time in seconds that the most recent step was triggered after it was
+        scheduled.
+        """
+        return self._lateness
+
+    @property
+    def max_lateness(self) -> float:
+        """The largest amount of time in seconds that a step has been triggered after it was
+        scheduled since the statistics were last reset.
+        """
+        return self._max_lateness
+
+    @property
+    def jitter(self) -> float:
+        """The smoothed variation in lateness between consecutive steps in seconds, calculated as a
+        running average in the same manner as RTP interarrival jitter.
+        """
+        return self._jitter
+
+    @property
+    def missed_steps(self) -> int:
+        """The number of steps which the timer has fallen behind by since the statistics were last
+        reset. How these steps were handled is determined by :attr:`catch_up`.
+        """
+        return self._missed_steps
+
+    def reset_stats(self) -> None:
+        """Reset the timing statistics: :attr:`lateness`, :attr:`max_lateness`, :attr:`jitter`,
+        and :attr:`missed_steps`.
+        """
+        self._lateness = 0.0
+        self._max_lateness = 0.0
+        self._jitter = 0.0
+        self._missed_steps = 0
+
+    _velocity_curve: int | tuple[float] = VelocityCurve.LINEAR
+    _velocity_table: list[float] = None
+
+    @property
+    def velocity_curve(self) -> int | tuple[float]:
+        """The curve used to map the velocity of notes as they are pressed. Use one of the constants
+        of :class:`VelocityCurve` or a custom sequence of at least 2 velocities (0.0-1.0) which will
+        be interpolated evenly across the full range of velocity. The curve is compiled into a
+        lookup table when set. Defaults to :const:`VelocityCurve.LINEAR`.
+        """
+        return self._velocity_curve
+
+    @velocity_curve.setter
+    def velocity_curve(self, value: int | tuple[float]) -> None:
+        self._velocity_table = _compile_velocity_curve(value, self._fixed_point)
+        self._velocity_curve = value
+
+    _fixed_point: int = 0
+
+    def _set_fixed_point(self, bits: int) -> None:
+        # Integer velocities from a fixed-point keyboard are looked up directly in the curve table
+        self._fixed_point = bits
+        self._velocity_table = _compile_velocity_curve(self._velocity_curve, bits)
+
+    _last_press: list[int] = None
+    _clock: "Clock" = None
+    _period: int = 1
+    _release_at: float = None
 
     async def update(self):
         """Update the timer object and call any relevant callbacks if a new beat step or the end of
         the gate of a step is reached. The actual functionality of this method will depend on the
-        child class that utilizes the :class:`Timer` parent class.
+        child class that utilizes the :class:`Timer` parent class. Steps are scheduled on absolute
+        deadlines so that timing does not drift, and missed steps are handled as specified by
+        :attr:`catch_up`. While inactive, this method waits until the timer is activated. If the
+        timer has been added to a :class:`Clock`, the clock's update coroutine should be used
+        instead.
         """
         while True:
             if not self._active:
-                await self._sleep(0.01)
+                await self._enabled.wait()
+                continue
+            deadline = self._origin + self._tick * self._step_time
+            if self._release_at is not None and self._release_at < deadline:
+                await self._sleep_until(self._release_at)
+                self._release(self._release_at)
+                continue
+            await self._sleep_until(deadline)
+            if not self._active:
                 continue
+            self._schedule_step()
+            deadline = self._origin + self._tick * self._step_time
+            if self._release_at is not None:
+                self._release(deadline)
             self._update()
             self._do_step()
-            if self._last_press:
-                await self._sleep(self._gate_duration)
-                self._do_release()
-                await self._sleep(self._step_time - self._gate_duration)
-            else:
-                await self._sleep(self._step_time)
-
-    async def _sleep(self, delay: float):
-        self._now += delay
-        await asyncio.sleep(self._now - time.monotonic())
+            self._schedule_release(deadline)
+            self._tick += 1
+
+    async def _sleep_until(self, deadline: float) -> None:
+        delay = deadline - time.monotonic()
+        await asyncio.sleep(delay if delay > 0.0 else 0.0)
+
+    def _schedule_step(self) -> None:
+        # Measure the lateness of the current step and apply the catch up policy if necessary
+        late = max(time.monotonic() - self._origin - self._tick * self._step_time, 0.0)
+        if late >= self._step_time:
+            missed = int(late / self._step_time)
+            if self._catch_up == TimerCatchUp.SKIP:
+                self._tick += missed
+                self._missed_steps += missed
+            elif self._catch_up == TimerCatchUp.STRETCH:
+                self._origin += late
+                self._missed_steps += missed
+            elif self._lateness < self._step_time:  # TimerCatchUp.BURST
+                self._missed_steps += missed
+        self._jitter += (abs(late - self._lateness) - self._jitter) / 16.0
+        self._lateness = late
+        self._max_lateness = max(self._max_lateness, late)
 
     def _update(self):
         pass
@@ -427,6 +1079,11 @@ class Timer:
 
     def _do_press(self, notenum, velocity):
         if callable(self.on_press):
+            if self._velocity_table is not None:
+                if self._fixed_point and type(velocity) is int:
+                    velocity = self._velocity_table[velocity >> (self._fixed_point - 7)]
+                else:
+                    velocity = _map_velocity(self._velocity_table, velocity)
             self.on_press(notenum, velocity)
             self._last_press.append(notenum)
 
@@ -436,6 +1093,154 @@ class Timer:
                 self.on_release(notenum)
             self._last_press.clear()
 
+    def _schedule_release(self, deadline: float) -> None:
+        # Schedule the end of the gate of the notes pressed by the step at the deadline
+        if self._last_press:
+            self._release_at = deadline + self._gate_duration
+
+    def _release(self, now: float) -> None:
+        # Release the pressed notes once the end of their gate has been reached
+        self._release_at = None
+        self._do_release()
+
+
+_CLOCK_RESOLUTION = const(24)
+
+
+def _gcd(a: int, b: int) -> int:
+    while b:
+        a, b = b, a % b
+    return a
+
+
+class Clock(Timer):
+    """A master clock used to drive multiple :class:`Timer` objects, such as :class:`Arpeggiator`
+    and :class:`Sequencer`, from a single coroutine with one wakeup per tick. The clock ticks at
+    the lowest common resolution of the :attr:`Timer.steps` value of each timer, and each timer is
+    stepped every n ticks so that their steps line up exactly. Step divisions are resolved to 1/24
+    of a step per beat.
+
+    :param bpm: The beats per minute of the clock and all of its timers.
+    """
+
+    def __init__(self, bpm: float = 120.0):
+        self._timers = []
+        Timer.__init__(self, bpm=bpm, steps=TimerStep.QUARTER)
+
+    @property
+    def steps(self) -> float:
+        """The number of ticks per beat of the clock as a beat division. This value is derived from
+        the :attr:`Timer.steps` value of each timer and can't be set directly. Setting this property
+        only recomputes the tick resolution from the current timers.
+        """
+        return self._steps
+
+    @steps.setter
+    def steps(self, value: float) -> None:
+        self._update_resolution()
+
+    @property
+    def timers(self) -> tuple[Timer]:
+        """The :class:`Timer` objects driven by this clock."""
+        return tuple(self._timers)
+
+    def add(self, timer: Timer) -> None:
+        """Drive a :class:`Timer` object using this clock. The tempo of the timer will be set to
+        the tempo of the clock, and the tick resolution of the clock will be updated to match the
+        steps of the timer. The timer's own :meth:`Timer.update` coroutine should not be used.
+
+        :param timer: The :class:`Timer` object to add.
+        """
+        if timer._clock is self:
+            return
+        if timer._clock is not None:
+            timer._clock.remove(timer)
+        self._timers.append(timer)
+        timer._clock = self
+        timer._bpm = self._bpm
+        timer._update_timing()
+        self._update_resolution()
+
+    def remove(self, timer: Timer) -> None:
+        """Stop driving a :class:`Timer` object using this clock. Any notes pressed by the timer
+        will be released.
+
+        :param timer: The :class:`Timer` object to remove.
+        """
+        if timer._clock is not self:
+            return
+        self._timers.remove(timer)
+        timer._clock = None
+        timer._release_at = None
+        timer._do_release()
+        self._update_resolution()
+
+    def _update_resolution(self) -> None:
+        ticks = 1
+        for timer in self._timers:
+            steps = max(round(timer._steps * _CLOCK_RESOLUTION), 1)
+            ticks = ticks * steps // _gcd(ticks, steps)
+        for timer in self._timers:
+            timer._period = ticks // max(round(timer._steps * _CLOCK_RESOLUTION), 1)
+        self._steps = ticks / _CLOCK_RESOLUTION if self._timers else TimerStep.QUARTER
+        self._update_timing()
+
+    def _update_timing(self) -> None:
+        Timer._update_timing(self)
+        for timer in self._timers:
+            timer._bpm = self._bpm
+            timer._update_timing()
+
+    async def update(self):
+        """Update the clock and all of its timers. Timer steps are triggered on each tick of the
+        clock which lines up with their step division, and the end of the gate of each step is
+        handled within the same coroutine.
+        """
+        while True:
+            if not self._active:
+                await self._enabled.wait()
+                continue
+            deadline = self._origin + self._tick * self._step_time
+            release = None
+            for timer in self._timers:
+                if timer._release_at is not None and (
+                    release is None or timer._release_at < release
+                ):
+                    release = timer._release_at
+            if release is not None and release < deadline:
+                await self._sleep_until(release)
+                self._release_timers()
+                continue
+            await self._sleep_until(deadline)
+            if not self._active:
+                continue
+            self._schedule_step()
+            self._update()
+            self._do_step()
+            self._tick += 1
+
+    def _do_release(self):
+        # Release the notes of all timers when the clock is stopped
+        for timer in self._timers:
+            timer._release_at = None
+            timer._do_release()
+
+    def _release_timers(self) -> None:
+        now = time.monotonic()
+        for timer in self._timers:
+            if timer._release_at is not None and timer._release_at <= now:
+                timer._release(now)
+
+    def _update(self):
+        deadline = self._origin + self._tick * self._step_time
+        for timer in self._timers:
+            if timer._active and not self._tick % timer._period:
+                if timer._release_at is not None:
+                    timer._release(deadline)
+                timer._update()
+                timer._do_step()
+                timer._schedule_release(deadline)
+
 
 class ArpeggiatorMode:
     """An enum-like class containing constaints for the possible modes of the :class:`Arpeggiator`
@@ -487,6 +1292,9 @@ class Arpeggiator(Timer):
             bpm=bpm,
             steps=steps,
         )
+        self._raw_notes = []
+        self._octave_notes = []
+        self._pattern = []
         self.mode = mode
 
     _pos: int = 0
@@ -505,8 +1313,8 @@ class Arpeggiator(Timer):
     @octaves.setter
     def octaves(self, value: int) -> None:
         self._octaves = value
-        if self._notes:
-            self.notes = self._raw_notes
+        if self._raw_notes:
+            self._build()
 
     _probability: float = 1.0
 
@@ -531,79 +1339,503 @@ class Arpeggiator(Timer):
     @mode.setter
     def mode(self, value: int) -> None:
         self._mode = value % 6
-        if self._notes:
-            self.notes = self._raw_notes
+        if self._raw_notes:
+            self._build()
 
-    _raw_notes: list[Note] = []
-    _notes: list[Note] = []
+    pool: NotePool = None
+    """The :class:`NotePool` used to allocate the octave-transposed :class:`Note` objects when
+    :attr:`octaves` is set. If `None`, new :class:`Note` objects are allocated whenever the notes
+    are updated. When assigned to a :class:`Keyboard`, the keyboard's pool is used by default.
+    """
 
-    def _get_notes(self, notes: list[Note] = []):
-        if not notes:
-            return notes
-
-        if abs(self._octaves) > 0:
-            l = len(notes)
-            for octave in range(1, abs(self._octaves) + 1):
-                for i in range(0, l):
-                    notes.append(
-                        Note(
-                            notes[i].notenum + octave * (-1 if self._octaves < 0 else 1) * 12,
-                            notes[i].velocity,
-                        )
-                    )
-
-        if self._mode == ArpeggiatorMode.UP:
-            notes.sort()
-        elif self._mode == ArpeggiatorMode.DOWN:
-            notes.sort(reverse=True)
+    _raw_notes: list[Note] = None
+    _octave_notes: list[list[Note]] = None
+    _pattern: list[Note] = None
+    _notes: list[Note] = None
+
+    def _new_note(self, notenum: int, velocity: float = 1.0) -> Note:
+        if self.pool is not None:
+            return self.pool.acquire(notenum, velocity)
+        return Note(notenum, velocity)
+
+    def _get_octave_notes(self, note: Note) -> list[Note]:
+        return [
+            self._new_note(
+                note.notenum + octave * (-1 if self._octaves < 0 else 1) * 12, note.velocity
+            )
+            for octave in range(1, abs(self._octaves) + 1)
+        ]
+
+    def _release_octave_notes(self, notes: list[Note]) -> None:
+        if self.pool is not None:
+            for note in notes:
+                self.pool.release(note)
+
+    def _build(self) -> None:
+        # The pattern is kept sorted by note value for UP, DOWN, UPDOWN, and DOWNUP modes and in
+        # played order for PLAYED and RANDOM modes. Descending and mirrored patterns are indexed
+        # virtually by _pattern_index rather than being stored.
+        for notes in self._octave_notes:
+            self._release_octave_notes(notes)
+        self._octave_notes = [self._get_octave_notes(note) for note in self._raw_notes]
+        self._pattern = self._raw_notes.copy()
+        for octave in range(abs(self._octaves)):
+            for notes in self._octave_notes:
+                self._pattern.append(notes[octave])
+        if self._mode <= ArpeggiatorMode.DOWNUP:
+            self._pattern.sort(key=lambda note: note.notenum)
+        self._notes = None
+
+    def _pattern_length(self) -> int:
+        length = len(self._pattern)
+        if length > 2 and self._mode in {ArpeggiatorMode.UPDOWN, ArpeggiatorMode.DOWNUP}:
+            return length * 2 - 2
+        return length
+
+    def _pattern_index(self, index: int) -> int:
+        length = len(self._pattern)
+        if self._mode == ArpeggiatorMode.DOWN:
+            return length - 1 - index
         elif self._mode == ArpeggiatorMode.UPDOWN:
-            notes.sort()
-            if len(notes) > 2:
-                _notes = notes[1:-1].copy()
-                _notes.reverse()
-                notes = notes + _notes
+            return index if index < length else length * 2 - 2 - index
         elif self._mode == ArpeggiatorMode.DOWNUP:
-            notes.sort(reverse=True)
-            if len(notes) > 2:
-                _notes = notes[1:-1].copy()
-                _notes.reverse()
-                notes = notes + _notes
-        # PLAYED = notes stay as is, RANDOM = index is randomized on update
-
-        return notes
+            return length - 1 - index if index < length else index - length + 1
+        return index  # UP, PLAYED, RANDOM
 
     @property
     def notes(self) -> list[Note]:
         """The :class:`Note` objects which the arpeggiator is currently stepping through ordered as
         specified by :attr:`mode` and affected by :attr:`octaves`.
         """
+        if self._notes is None:
+            self._notes = [
+                self._pattern[self._pattern_index(i)] for i in range(self._pattern_length())
+            ]
         return self._notes
 
     @notes.setter
     def notes(self, value: list[Note]) -> None:
-        if not self._notes:
+        if not self._pattern:
             self._reset()
-        self._raw_notes = value.copy()
-        self._notes = self._get_notes(value)
+        self._raw_notes = list(value)
+        self._build()
+
+    def append(self, note: Note) -> None:
+        """Add a single note to the arpeggiator. The note and its octave-transposed copies are
+        inserted into the current pattern without rebuilding it.
+
+        :param note: The :class:`Note` object to add.
+        """
+        if not self._pattern:
+            self._reset()
+        notes = self._get_octave_notes(note)
+        if self._mode <= ArpeggiatorMode.DOWNUP:
+            _insert_note(self._pattern, note)
+            for i in notes:
+                _insert_note(self._pattern, i)
+        else:  # ArpeggiatorMode.PLAYED, ArpeggiatorMode.RANDOM
+            length = len(self._raw_notes)
+            for octave in range(len(notes) + 1):
+                self._pattern.insert(
+                    octave * (length + 1) + length, notes[octave - 1] if octave else note
+                )
+        self._raw_notes.append(note)
+        self._octave_notes.append(notes)
+        self._notes = None
+
+    def remove(self, notenum: int | Note) -> None:
+        """Remove a single note and its octave-transposed copies from the arpeggiator without
+        rebuilding the pattern.
+
+        :param notenum: The value of the note to remove. Can also use a :class:`Note` object.
+        """
+        if isinstance(notenum, Note):
+            notenum = notenum.notenum
+        for index in range(len(self._raw_notes)):
+            if self._raw_notes[index].notenum == notenum:
+                break
+        else:
+            return
+        length = len(self._raw_notes)
+        note = self._raw_notes.pop(index)
+        notes = self._octave_notes.pop(index)
+        if self._mode <= ArpeggiatorMode.DOWNUP:
+            _remove_note(self._pattern, note)
+            for i in notes:
+                _remove_note(self._pattern, i)
+        else:  # ArpeggiatorMode.PLAYED, ArpeggiatorMode.RANDOM
+            for octave in range(len(notes), -1, -1):
+                del self._pattern[octave * length + index]
+        self._release_octave_notes(notes)
+        self._notes = None
 
     def _update(self):
-        if self._notes:
+        if self._pattern:
             if self._probability < 1.0 and (
                 self._probability == 0.0 or random.random() > self._probability
             ):
                 return
             if self.mode == ArpeggiatorMode.RANDOM:
-                self._pos = random.randrange(0, len(self._notes), 1)
+                self._pos = random.randrange(0, len(self._pattern), 1)
             else:
-                self._pos = (self._pos + 1) % len(self._notes)
-            self._do_press(self._notes[self._pos].notenum, self._notes[self._pos].velocity)
+                self._pos = (self._pos + 1) % self._pattern_length()
+            note = self._pattern[self._pattern_index(self._pos)]
+            self._do_press(note.notenum, note.velocity)
+
+
+_PATTERN_STRIDE = const(3)
+_PATTERN_SET = const(1)
+_PATTERN_MAGIC = b"SKPT"
+_PATTERN_VERSION = const(1)
+_PATTERN_HEADER = "<4sBBHH"
+_PATTERN_HEADER_SIZE = const(10)
+
+
+def _unpack_pattern_header(
+    buffer: bytes | bytearray | memoryview, offset: int = 0
+) -> tuple[int, int]:
+    if len(buffer) - offset < _PATTERN_HEADER_SIZE:
+        raise ValueError("Truncated pattern data")
+    magic, version, _, length, tracks = struct.unpack_from(_PATTERN_HEADER, buffer, offset)
+    if magic != _PATTERN_MAGIC:
+        raise ValueError("Invalid pattern data")
+    if version != _PATTERN_VERSION:
+        raise ValueError("Unsupported pattern version")
+    if length < 1 or tracks < 1:
+        raise ValueError("Invalid pattern size")
+    return length, tracks
+
+
+class PatternTrack:
+    """A lightweight view of a single track of a :class:`Pattern` object which doesn't copy any
+    note data. Steps can be read or written by index as (notenum, velocity) tuples, or `None` if
+    the step is empty. Negative indices count from the end of the track and out of range indices
+    raise an :class:`IndexError`, as with a list. Slices can be read, which returns a list of note
+    tuples, but can't be assigned. These objects are created by :meth:`Pattern.get_track`.
+
+    :param pattern: The :class:`Pattern` object which stores the note data.
+    :param track: Index of the track (0-based).
+    """
+
+    def __init__(self, pattern: "Pattern", track: int):
+        self._pattern = pattern
+        self._track = track
+
+    def __len__(self) -> int:
+        return self._pattern.length
+
+    def _position(self, position: int) -> int:
+        if type(position) is not int:
+            raise TypeError("Track indices must be integers or slices")
+        length = self._pattern.length
+        if position < 0:
+            position += length
+        if not 0 <= position < length:
+            raise IndexError("Track index out of range")
+        return position
+
+    def __getitem__(self, position: int | slice) -> tuple[int, float] | list[tuple[int, float]]:
+        if type(position) is slice:
+            return [
+                self._pattern.get_note(i, self._track)
+                for i in range(*position.indices(self._pattern.length))
+            ]
+        return self._pattern.get_note(self._position(position), self._track)
+
+    def __setitem__(self, position: int, value: tuple[int, float]) -> None:
+        if type(position) is slice:
+            raise TypeError("Track slices can't be assigned")
+        position = self._position(position)
+        if value is None:
+            self._pattern.remove_note(position, self._track)
+        else:
+            self._pattern.set_note(position, value[0], value[1], self._track)
+
+    def __iter__(self):
+        for position in range(self._pattern.length):
+            yield self._pattern.get_note(position, self._track)
+
+
+class Pattern:
+    """Note data of a :class:`Sequencer` stored within a single contiguous buffer. Each step of
+    each track uses 3 bytes for the note value (0-127), velocity (stored with 7-bit resolution),
+    and flags. Steps without any flags are empty. Changing the length or number of tracks
+    reallocates the buffer once while retaining any existing note data. A bitmask of the tracks
+    with a playable note is kept for each step so that empty steps can be skipped quickly.
+
+    :param length: The number of steps of each track. The minimum value allowed is 1.
+    :param tracks: The number of tracks. The minimum value allowed is 1.
+    """
+
+    def __init__(self, length: int = 16, tracks: int = 1):
+        self._length = max(length, 1)
+        self._tracks = max(tracks, 1)
+        self._data = bytearray(self._length * self._tracks * _PATTERN_STRIDE)
+        self._index = [0] * self._length
+
+    def _update_index(self) -> None:
+        # Rebuild the bitmask of playable tracks for every step
+        if len(self._index) > self._length:
+            del self._index[self._length :]
+        elif len(self._index) < self._length:
+            self._index.extend([0] * (self._length - len(self._index)))
+        for position in range(self._length):
+            mask = 0
+            i = position * _PATTERN_STRIDE
+            for track in range(self._tracks):
+                if self._data[i + 2] and self._data[i] and self._data[i + 1]:
+                    mask |= 1 << track
+                i += self._length * _PATTERN_STRIDE
+            self._index[position] = mask
+
+    def get_step(self, position: int) -> int:
+        """Get a bitmask of the tracks which have a playable note (with a note value and velocity
+        greater than 0) at a specific step index.
+
+        :param position: Index of the step (0-based). Will be limited to the track length.
+        :return: bitmask of tracks where bit 0 represents the first track
+        """
+        return self._index[min(max(position, 0), self._length - 1)]
+
+    @property
+    def length(self) -> int:
+        """The number of steps for each track. If the length is shortened, all of the step data
+        beyond the new length will be deleted. The minimum allowed is 1.
+        """
+        return self._length
+
+    @length.setter
+    def length(self, value: int) -> None:
+        value = max(value, 1)
+        if value == self._length:
+            return
+        data = bytearray(value * self._tracks * _PATTERN_STRIDE)
+        size = min(value, self._length) * _PATTERN_STRIDE
+        source = memoryview(self._data)
+        for i in range(self._tracks):
+            offset = i * value * _PATTERN_STRIDE
+            data[offset : offset + size] = source[
+                i * self._length * _PATTERN_STRIDE : i * self._length * _PATTERN_STRIDE + size
+            ]
+        self._data = data
+        self._length = value
+        self._update_index()
+
+    @property
+    def tracks(self) -> int:
+        """The number of note tracks. If the number of tracks is shortened, the tracks at an index
+        greater to or equal than the number will be deleted. If a larger number of tracks is
+        provided, the newly created tracks will be empty. The minimum allowed is 1.
+        """
+        return self._tracks
+
+    @tracks.setter
+    def tracks(self, value: int) -> None:
+        value = max(value, 1)
+        size = value * self._length * _PATTERN_STRIDE
+        if value < self._tracks:
+            self._data = bytearray(memoryview(self._data)[:size])
+        elif value > self._tracks:
+            data = bytearray(size)
+            data[: len(self._data)] = self._data
+            self._data = data
+        self._tracks = value
+        self._update_index()
+
+    def _offset(self, position: int, track: int) -> int:
+        track = min(max(track, 0), self._tracks - 1)
+        position = min(max(position, 0), self._length - 1)
+        return (track * self._length + position) * _PATTERN_STRIDE
+
+    def _index_step(self, position: int, track: int, playable: bool) -> None:
+        position = min(max(position, 0), self._length - 1)
+        if playable:
+            self._index[position] |= 1 << min(max(track, 0), self._tracks - 1)
+        else:
+            self._index[position] &= ~(1 << min(max(track, 0), self._tracks - 1))
+
+    def set_note(self, position: int, notenum: int, velocity: float = 1.0, track: int = 0) -> None:
+        """Set the note value and velocity of a track at a specific step index.
+
+        :param position: Index of the step (0-based). Will be limited to the track length.
+        :param notenum: Value of the note (0-127).
+        :param velocity: Velocity of the note (0.0-1.0).
+        :param track: Index of the track (0-based). Will be limited to the track count.
+        """
+        i = self._offset(position, track)
+        self._data[i] = min(max(notenum, 0), 127)
+        self._data[i + 1] = min(max(int(velocity * 127 + 0.5), 0), 127)
+        self._data[i + 2] = _PATTERN_SET
+        self._index_step(position, track, self._data[i] and self._data[i + 1])
+
+    def get_note(self, position: int, track: int = 0) -> tuple[int, float]:
+        """Get the note data for a specified track and step position. If a note isn't defined at
+        specific index, a value of `None` will be returned.
+
+        :param position: Index of the step (0-based). Will be limited to the track length.
+        :param track: Index of the track (0-based). Will be limited to the track count.
+        :return: note data (notenum, velocity)
+        """
+        i = self._offset(position, track)
+        if not self._data[i + 2]:
+            return None
+        return (self._data[i], self._data[i + 1] / 127)
+
+    def has_note(self, position: int, track: int = 0) -> bool:
+        """Check whether or note a specific step within a track has been set with note data.
+
+        :param position: Index of the step (0-based). Will be limited to the track length.
+        :param track: Index of the track (0-based). Will be limited to the track count.
+        :return: if the track step has a note
+        """
+        return bool(self._data[self._offset(position, track) + 2])
+
+    def remove_note(self, position: int, track: int = 0) -> None:
+        """Remove the note data as a specific step within a track.
+
+        :param position: Index of the step (0-based). Will be limited to the track length.
+        :param track: Index of the track (0-based). Will be limited to the track count.
+        """
+        i = self._offset(position, track)
+        self._data[i] = self._data[i + 1] = self._data[i + 2] = 0
+        self._index_step(position, track, False)
+
+    def get_track(self, track: int = 0) -> PatternTrack:
+        """Get a view of the note data for a specified track index (0-based).
+
+        :param track: Index of the track (0-based). Will be limited to the track count.
+        :return: track view of note tuples as (notenum, velocity)
+        """
+        return PatternTrack(self, min(max(track, 0), self._tracks - 1))
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the pattern in bytes when saved in the binary pattern format, including
+        the header.
+        """
+        return _PATTERN_HEADER_SIZE + len(self._data)
+
+    def save(self, stream) -> None:
+        """Write the pattern to a stream in the binary pattern format. The format consists of a
+        10-byte header (the characters "SKPT", a version number, a reserved byte, and the length
+        and number of tracks as 16-bit little-endian integers) followed by the step data. Multiple
+        patterns can be written to the same stream to create a pattern bank.
+
+        :param stream: Any object which supports :code:`write`, such as a file opened in binary
+            mode.
+        """
+        stream.write(
+            struct.pack(
+                _PATTERN_HEADER, _PATTERN_MAGIC, _PATTERN_VERSION, 0, self._length, self._tracks
+            )
+        )
+        stream.write(self._data)
+
+    def load(self, stream) -> bool:
+        """Read a pattern in the binary pattern format from a stream using :code:`readinto`. If the
+        size of the pattern matches, the existing buffer is reused without any allocation.
+
+        :param stream: Any object which supports :code:`readinto`, such as a file opened in binary
+            mode.
+        :return: `False` if the end of the stream has been reached, otherwise `True`
+        :raises ValueError: if the pattern data is invalid or incomplete. If the header is invalid,
+            the pattern is left unchanged. If the step data is incomplete, the pattern is resized
+            to match the header and cleared.
+        """
+        header = bytearray(_PATTERN_HEADER_SIZE)
+        count = stream.readinto(header)
+        if not count:
+            return False
+        if count != _PATTERN_HEADER_SIZE:
+            raise ValueError("Truncated pattern data")
+        length, tracks = _unpack_pattern_header(header)
+        size = length * tracks * _PATTERN_STRIDE
+        data = self._data
+        if len(data) != size or not isinstance(data, bytearray):
+            data = bytearray(size)
+        complete = stream.readinto(data) == size
+        if not complete:
+            # Clear any partially read step data
+            for i in range(size):
+                data[i] = 0
+        self._data = data
+        self._length, self._tracks = length, tracks
+        self._update_index()
+        if not complete:
+            raise ValueError("Truncated pattern data")
+        return True
+
+    @staticmethod
+    def from_buffer(buffer: bytes | bytearray | memoryview, offset: int = 0) -> "Pattern":
+        """Create a pattern which uses a region of an existing buffer in the binary pattern format
+        as its backing store without copying any step data, such as a memory-mapped file. The
+        pattern is only writable if the buffer is writable, but changing the length or number of
+        tracks will always copy the data into a new buffer.
+
+        :param buffer: The buffer containing the pattern data.
+        :param offset: The position of the pattern header within the buffer in bytes.
+        :raises ValueError: if the pattern data is invalid or incomplete
+        """
+        length, tracks = _unpack_pattern_header(buffer, offset)
+        offset += _PATTERN_HEADER_SIZE
+        size = length * tracks * _PATTERN_STRIDE
+        if len(buffer) - offset < size:
+            raise ValueError("Truncated pattern data")
+        pattern = Pattern()
+        pattern._data = memoryview(buffer)[offset : offset + size]
+        pattern._length, pattern._tracks = length, tracks
+        pattern._update_index()
+        return pattern
+
+    @staticmethod
+    def read_bank(path: str) -> list["Pattern"]:
+        """Read all of the patterns within a pattern bank file. If the :mod:`mmap` module is
+        available, the file is memory-mapped so that each pattern references the file data
+        directly (changes to these patterns are not written back to the file). Otherwise, each
+        pattern is read into its own buffer.
+
+        :param path: The location of the pattern bank file.
+        :return: list of patterns in the order they were saved
+        """
+        patterns = []
+        with open(path, "rb") as file:
+            try:
+                import mmap
+            except ImportError:
+                pattern = Pattern()
+                while pattern.load(file):
+                    patterns.append(pattern)
+                    pattern = Pattern()
+                return patterns
+
+            if not file.seek(0, 2):
+                return patterns
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        offset = 0
+        while offset < len(buffer):
+            patterns.append(Pattern.from_buffer(buffer, offset))
+            offset += patterns[-1].nbytes
+        return patterns
+
+    @staticmethod
+    def write_bank(path: str, patterns: list["Pattern"]) -> None:
+        """Write multiple patterns to a pattern bank file which can be read by :meth:`read_bank`.
+
+        :param path: The location of the pattern bank file.
+        :param patterns: The patterns to save.
+        """
+        with open(path, "wb") as file:
+            for pattern in patterns:
+                pattern.save(file)
 
 
 class Sequencer(Timer):
     """Sequence notes using the :class:`Timer` class to create a multi-track note sequencer. By
     default, the Sequencer is set up for a single 4/4 measure of 16 notes with one track. Each note
     of each track can be assigned any note value and velocity. The length and number of tracks can
-    be reassigned during runtime.
+    be reassigned during runtime. Note data is stored within a :class:`Pattern` object. Each track
+    can also be given its own length and step division to create polymeters and polyrhythms which
+    are all driven by the same timer.
 
     :param length: The number of steps of each track. The minimum value allowed is 1.
     :param tracks: The number of tracks to create and sequence. The minimum value allowed is 1.
@@ -611,14 +1843,120 @@ class Sequencer(Timer):
     """
 
     def __init__(self, length: int = 16, tracks: int = 1, bpm: float = 120.0):
+        self._pattern = Pattern(length, tracks)
+        self._track_lengths = []
+        self._track_steps = []
+        self._track_periods = []
+        self._track_pos = []
+        self._track_phase = []
+        self._release_tracks = []
+        self._release_times = []
         Timer.__init__(self, bpm=bpm, steps=TimerStep.SIXTEENTH)
-        self.length = length
-        self.tracks = tracks
-        self._data = [[None for j in range(self._length)] for i in range(self._tracks)]
 
-    _data: list = None
+    _base_steps: float = TimerStep.SIXTEENTH
+
+    @property
+    def steps(self) -> float:
+        """The number of steps per beat (or the beat division) of all tracks which don't have their
+        own step division. The minimum value allowed is 0.25, or a whole note. The pre-defined
+        :class:`TimerStep` constants can be used here. If any tracks have their own step division,
+        the timer runs at the finest common division of all tracks, and :attr:`gate` is relative
+        to that division. The gate of each track is relative to its own step division.
+        """
+        return self._base_steps
+
+    @steps.setter
+    def steps(self, value: float) -> None:
+        self._base_steps = max(value, TimerStep.WHOLE)
+        self._update_divisions()
+
+    _pattern: Pattern = None
+
+    @property
+    def pattern(self) -> Pattern:
+        """The :class:`Pattern` object containing the note data of the sequencer. Patterns can be
+        swapped out during runtime, and the position will wrap around if the new pattern is shorter.
+        """
+        return self._pattern
+
+    @pattern.setter
+    def pattern(self, value: Pattern) -> None:
+        self._pattern = value
+        self._pos %= value.length
+
+    _next_pattern: Pattern = None
 
-    _length: int = 16
+    @property
+    def next_pattern(self) -> Pattern:
+        """A :class:`Pattern` object which will replace :attr:`pattern` once the current pattern
+        reaches its end. This allows a pattern to be edited or loaded while inactive and swapped in
+        at the pattern boundary without interrupting playback. Set as `None` to cancel. Reset to
+        `None` once the patterns have been swapped.
+        """
+        return self._next_pattern
+
+    @next_pattern.setter
+    def next_pattern(self, value: Pattern) -> None:
+        self._next_pattern = value
+
+    _chain: tuple[tuple[Pattern, int]] = ()
+    _chain_pos: int = 0
+    _repeat: int = 0
+
+    @property
+    def chain(self) -> tuple[tuple[Pattern, int]]:
+        """A song chain of patterns formatted as a sequence of (pattern:Pattern, repeats:int)
+        tuples. Each pattern is played the provided number of times before advancing to the next
+        pattern at the pattern boundary, and the chain loops back to the start once it is complete.
+        When set while the sequencer is active, the first pattern of the chain is queued as
+        :attr:`next_pattern`. Otherwise, it replaces :attr:`pattern` immediately and the position is
+        reset so that playback starts at the beginning of the chain. Set as an empty sequence to
+        disable.
+        """
+        return self._chain
+
+    @chain.setter
+    def chain(self, value: tuple[tuple[Pattern, int]]) -> None:
+        self._chain = tuple(value)
+        self._chain_pos = 0
+        self._repeat = 0
+        if not self._chain:
+            self._next_pattern = None
+        elif self._active:
+            self._next_pattern = self._chain[0][0]
+        else:
+            self._pattern, self._next_pattern = self._chain[0][0], None
+            self._start()
+
+    @property
+    def chain_position(self) -> int:
+        """The index of the current pattern within :attr:`chain` (0-based)."""
+        return self._chain_pos
+
+    _starting: bool = False
+
+    def _start(self) -> None:
+        # Play step 0 of the pattern on the first step after starting
+        self._pos = 0
+        self._starting = True
+        self._track_pos.clear()
+        self._track_phase.clear()
+        self._phase = 1
+
+    def _advance_pattern(self) -> bool:
+        # Swap patterns at the pattern boundary, the first step isn't counted as a repeat
+        if self._starting:
+            self._starting = False
+        elif self._chain and self._next_pattern is None:
+            self._repeat += 1
+            if self._repeat >= self._chain[self._chain_pos][1]:
+                self._repeat = 0
+                self._chain_pos = (self._chain_pos + 1) % len(self._chain)
+                self._next_pattern = self._chain[self._chain_pos][0]
+        if self._next_pattern is None:
+            return False
+        self._pattern, self._next_pattern = self._next_pattern, None
+        return True
 
     @property
     def length(self) -> int:
@@ -627,21 +1965,11 @@ class Sequencer(Timer):
         should loop back around automatically to the start of the track data. The minimum allowed
         is 1.
         """
-        return self._length
+        return self._pattern.length
 
     @length.setter
     def length(self, value: int) -> None:
-        value = max(value, 1)
-        if self._data:
-            if value > self._length:
-                for i in range(self._tracks):
-                    self._data[i] = self._data[i] + [None for j in range(value - self._length)]
-            elif value < self._length:
-                for i in range(self._tracks):
-                    del self._data[i][value:]
-        self._length = value
-
-    _tracks: int = 1
+        self._pattern.length = value
 
     @property
     def tracks(self) -> int:
@@ -649,40 +1977,32 @@ class Sequencer(Timer):
         at an index greater to or equal than the number will be deleted. If a larger number of
         tracks is provided, the newly created tracks will be empty. The minimum allowed is 1.
         """
-        return self._tracks
+        return self._pattern.tracks
 
     @tracks.setter
     def tracks(self, value: int) -> None:
-        value = max(value, 1)
-        if self._data:
-            if value > self._tracks:
-                self._data = self._data + [
-                    [None for j in range(self._length)] for i in range(value - self._tracks)
-                ]
-            elif value < self._tracks:
-                del self._data[value:]
-        self._tracks = value
+        self._pattern.tracks = value
 
     _pos: int = 0
 
     @property
     def position(self) -> int:
-        """The current position of the sequencer within the track length (0-based)."""
+        """The current position of the sequencer within the track length (0-based). Playback
+        always starts from step 0 when the sequencer is activated.
+        """
         return self._pos
 
     def set_note(self, position: int, notenum: int, velocity: float = 1.0, track: int = 0) -> None:
         """Set the note value and velocity of a track at a specific step index.
 
         :param position: Index of the step (0-based). Will be limited to the track length.
-        :param notenum: Value of the note.
+        :param notenum: Value of the note (0-127).
         :param velocity: Velocity of the note (0.0-1.0).
         :param track: Index of the track (0-based). Will be limited to the track count.
         """
-        track = min(max(track, 0), self._tracks)
-        position = min(max(position, 0), self._length)
-        self._data[track][position] = (notenum, velocity)
+        self._pattern.set_note(position, notenum, velocity, track)
 
-    def get_note(self, position: int, track: int = 0) -> tuple[int, int]:
+    def get_note(self, position: int, track: int = 0) -> tuple[int, float]:
         """Get the note data for a specified track and step position. If a note isn't defined at
         specific index, a value of `None` will be returned.
 
@@ -690,9 +2010,7 @@ class Sequencer(Timer):
         :param track: Index of the track (0-based). Will be limited to the track count.
         :return: note data (notenum, velocity)
         """
-        track = min(max(track, 0), self._tracks)
-        position = min(max(position, 0), self._length)
-        return self._data[track][position]
+        return self._pattern.get_note(position, track)
 
     def has_note(self, position: int, track: int = 0) -> bool:
         """Check whether or note a specific step within a track has been set with note data.
@@ -701,7 +2019,7 @@ class Sequencer(Timer):
         :param track: Index of the track (0-based). Will be limited to the track count.
         :return: if the track step has a note
         """
-        return not self.get_note(position, track) is None
+        return self._pattern.has_note(position, track)
 
     def remove_note(self, position: int, track: int = 0) -> None:
         """Remove the note data as a specific step within a track.
@@ -709,17 +2027,111 @@ class Sequencer(Timer):
         :param position: Index of the step (0-based). Will be limited to the track length.
         :param track: Index of the track (0-based). Will be limited to the track count.
         """
-        track = min(max(track, 0), self._tracks)
-        position = min(max(position, 0), self._length)
-        self._data[track][position] = None
+        self._pattern.remove_note(position, track)
+
+    def get_track(self, track=0) -> PatternTrack:
+        """Get a view of the note data for a specified track index (0-based). The track data is
+        returned as a :class:`PatternTrack` view into the :class:`Pattern` object rather than a
+        list. Use :code:`list(sequencer.get_track(track))` to get a copy of the note data as a list.
+
+        :return: track view of note tuples as (notenum, velocity)
+        """
+        return self._pattern.get_track(track)
+
+    def _get_track_setting(self, settings: list, track: int):
+        return settings[track] if 0 <= track < len(settings) else None
+
+    def _set_track_setting(self, settings: list, track: int, value) -> None:
+        track = max(track, 0)
+        if track >= len(settings):
+            settings.extend([None] * (track + 1 - len(settings)))
+        settings[track] = value
+        self._update_divisions()
 
-    def get_track(self, track=0) -> list[tuple[int, int]]:
-        """Get list of note data for a specified track index (0-based). If the track isn't
-        available, a value of `None` will be returned.
+    def get_track_length(self, track: int = 0) -> int:
+        """Get the number of steps played by a track before it loops.
 
-        :return: track data list of note tuples as (notenum, velocity)
+        :param track: Index of the track (0-based).
+        :return: track length
         """
-        return self._data[min(max(track, 0), self._tracks)]
+        length = self._get_track_setting(self._track_lengths, track)
+        return min(length, self._pattern.length) if length else self._pattern.length
+
+    def set_track_length(self, track: int, length: int = None) -> None:
+        """Set the number of steps played by a track before it loops, independently of the other
+        tracks. The length is limited to the length of the :attr:`pattern`.
+
+        :param track: Index of the track (0-based).
+        :param length: The number of steps. Set as `None` to use the length of the pattern.
+        """
+        self._set_track_setting(self._track_lengths, track, max(length, 1) if length else None)
+
+    def get_track_steps(self, track: int = 0) -> float:
+        """Get the step division of a track.
+
+        :param track: Index of the track (0-based).
+        :return: steps per beat of the track
+        """
+        steps = self._get_track_setting(self._track_steps, track)
+        return steps if steps else self._base_steps
+
+    def set_track_steps(self, track: int, steps: float = None) -> None:
+        """Set the number of steps per beat of a track, independently of the other tracks. The
+        pre-defined :class:`TimerStep` constants can be used here.
+
+        :param track: Index of the track (0-based).
+        :param steps: The step division of the track. Set as `None` to use :attr:`steps`.
+        """
+        self._set_track_setting(
+            self._track_steps, track, max(steps, TimerStep.WHOLE) if steps else None
+        )
+
+    def get_track_position(self, track: int = 0) -> int:
+        """Get the current position of a track (0-based). Tracks without their own length and step
+        division are always at the same position as :attr:`position`.
+
+        :param track: Index of the track (0-based).
+        :return: track position
+        """
+        if not self._polymeter or not 0 <= track < len(self._track_pos):
+            return self._pos
+        return self._track_pos[track]
+
+    _polymeter: bool = False
+    _base_period: int = 1
+    _phase: int = 1
+    _stepped: bool = True
+
+    def _update_divisions(self) -> None:
+        # Determine the finest division of all tracks and the number of timer ticks per step
+        base = max(round(self._base_steps * _CLOCK_RESOLUTION), 1)
+        ticks = base
+        for steps in self._track_steps:
+            if steps:
+                track = max(round(steps * _CLOCK_RESOLUTION), 1)
+                ticks = ticks * track // _gcd(ticks, track)
+        self._base_period = ticks // base
+        self._track_periods.clear()
+        for steps in self._track_steps:
+            self._track_periods.append(
+                ticks // max(round(steps * _CLOCK_RESOLUTION), 1) if steps else self._base_period
+            )
+        polymeter = any(self._track_lengths) or any(
+            period != self._base_period for period in self._track_periods
+        )
+        if polymeter and not self._polymeter:
+            # Align all tracks with the current position
+            self._track_pos.clear()
+            self._track_phase.clear()
+            self._phase = 1
+        elif not polymeter:
+            self._stepped = True
+        self._polymeter = polymeter
+
+        self._steps = ticks / _CLOCK_RESOLUTION
+        self._update_timing()
+        if self._clock is not None:
+            self._clock._update_resolution()
 
     on_step: Callable[[int], None] = None
     """The callback method that is called when a step is triggered. This callback will fire whether
@@ -728,16 +2140,114 @@ class Sequencer(Timer):
     """
 
     def _update(self):
-        self._pos = (self._pos + 1) % self._length
-        for i in range(self._tracks):
-            note = self._data[i][self._pos]
-            if note and note[0] > 0 and note[1] > 0:
-                self._do_press(note[0], note[1])
+        if self._polymeter:
+            self._update_polymeter()
+            return
+        self._pos = 0 if self._starting else (self._pos + 1) % self._pattern._length
+        if not self._pos:
+            self._advance_pattern()
+        pattern = self._pattern
+        data, stride = pattern._data, pattern._length * _PATTERN_STRIDE
+        i = self._pos * _PATTERN_STRIDE
+        mask = pattern._index[self._pos]
+        track = 0
+        while mask:
+            if mask & 1:
+                self._press_track(data[i], data[i + 1] / 127, track)
+            mask >>= 1
+            i += stride
+            track += 1
+
+    def _update_polymeter(self):
+        # The base position drives the step callback and pattern boundary
+        self._phase -= 1
+        self._stepped = self._phase <= 0
+        restart = False
+        if self._stepped:
+            self._phase = self._base_period
+            self._pos = 0 if self._starting else (self._pos + 1) % self._pattern._length
+            restart = not self._pos and self._advance_pattern()
+
+        pattern = self._pattern
+        while len(self._track_pos) < pattern._tracks:
+            self._track_pos.append(self._pos - (1 if self._stepped else 0))
+            self._track_phase.append(1 if self._stepped else self._phase + 1)
+        data, stride = pattern._data, pattern._length * _PATTERN_STRIDE
+
+        # Advance each track by its own phase counter
+        for track in range(pattern._tracks):
+            if restart:
+                self._track_pos[track] = -1
+                self._track_phase[track] = 1
+            self._track_phase[track] -= 1
+            if self._track_phase[track] > 0:
+                continue
+            self._track_phase[track] = (
+                self._track_periods[track]
+                if track < len(self._track_periods)
+                else self._base_period
+            )
+            length = self._get_track_setting(self._track_lengths, track)
+            length = min(length, pattern._length) if length else pattern._length
+            position = self._track_pos[track] = (self._track_pos[track] + 1) % length
+            if (pattern._index[position] >> track) & 1:
+                i = track * stride + position * _PATTERN_STRIDE
+                self._press_track(data[i], data[i + 1] / 127, track)
 
     def _do_step(self):
-        if callable(self.on_step):
+        if callable(self.on_step) and self._stepped:
             self.on_step(self._pos)
 
+    _release_tracks: list[int] = None
+    _release_times: list[float] = None
+
+    def _press_track(self, notenum: int, velocity: float, track: int) -> None:
+        # Any note still held by the track is released before the track is pressed again
+        i = 0
+        while i < len(self._release_tracks):
+            if self._release_tracks[i] == track:
+                self._release_note(i)
+            else:
+                i += 1
+        self._do_press(notenum, velocity)
+        if len(self._last_press) > len(self._release_tracks):
+            self._release_tracks.append(track)
+            self._release_times.append(None)
+
+    def _do_release(self):
+        while self._last_press:
+            self._release_note(0)
+        self._release_at = None
+
+    def _schedule_release(self, deadline: float) -> None:
+        # Each note is released at the end of the gate of its own track's step division
+        for i in range(len(self._release_times)):
+            if self._release_times[i] is None:
+                track = self._release_tracks[i]
+                period = (
+                    self._track_periods[track]
+                    if track < len(self._track_periods)
+                    else self._base_period
+                )
+                self._release_times[i] = deadline + period * self._gate_duration
+        self._release_at = min(self._release_times) if self._release_times else None
+
+    def _release(self, now: float) -> None:
+        i = 0
+        while i < len(self._release_times):
+            if self._release_times[i] is not None and self._release_times[i] <= now:
+                self._release_note(i)
+            else:
+                i += 1
+        self._release_at = min(self._release_times) if self._release_times else None
+
+    def _release_note(self, index: int) -> None:
+        notenum = self._last_press.pop(index)
+        del self._release_tracks[index]
+        del self._release_times[index]
+        if callable(self.on_release):
+            self.on_release(notenum)
+
 
 class KeyboardMode:
     """An enum-like class representing Keyboard note handling modes."""
@@ -754,27 +2264,76 @@ class KeyboardMode:
     """
 
 
+class VoiceStealing:
+    """An enum-like class representing the policies used by :class:`Keyboard` to steal a voice
+    when a new note is played and no voices are available.
+    """
+
+    NONE: int = const(0)
+    """Voices are never stolen. Notes are allocated to voices according to the
+    :class:`KeyboardMode` of the keyboard.
+    """
+
+    OLDEST: int = const(1)
+    """Steal the voice which was assigned a note the longest time ago."""
+
+    QUIETEST: int = const(2)
+    """Steal the voice playing the note with the lowest velocity."""
+
+    HIGHEST: int = const(3)
+    """Steal the voice playing the note with the highest note value."""
+
+    LOWEST: int = const(4)
+    """Steal the voice playing the note with the lowest note value."""
+
+    RETRIGGER: int = const(5)
+    """When a note is played again, retrigger the voice which is already playing that note value.
+    Otherwise, steal the oldest voice.
+    """
+
+
+_NOTE_HELD = const(1)
+_NOTE_SUSTAINED = const(2)
+_NOTE_POOLED = const(4)
+_NOTE_STOLEN = const(8)
+
+
 class Keyboard:
     """Manage notes, voice allocation, arpeggiator assignment, sustain, and relevant callbacks using
     this class.
 
-    :param keys: A list of :class:`Key` objects which will be used to update the keyboard state.
+    :param keys: A list of :class:`Key` objects or a :class:`KeyScanner` object which will be used
+        to update the keyboard state.
     :param max_voices: The maximum number of voices/notes to be played at once.
     :param root: Set the base note number of the physical key inputs.
+    :param mode: The note allocation mode as specified by :class:`KeyboardMode` constants.
     """
 
     def __init__(
         self,
-        keys: tuple[Key] = [],
+        keys: tuple[Key] = (),
         max_voices: int = 1,
         root: int = 48,
         mode: int = KeyboardMode.HIGH,
     ):
         self.root = root
         self._keys = keys
+        self._recycled = []
+        self._timestamp = time.monotonic
+        self._timer_note = Note(0)
+        self._note_index = {}
+        self._note_flags = {}
+        self._sorted_notes = []
         self.mode = mode
+        self._voices = []
+        self._voice_map = {}
+        self._active_voices = []
+        self._inactive_voices = []
+        self._heap = []
+        self._heap_positions = {}
+        self._pending_notes = []
+        self._removed_notes = []
         self.max_voices = max_voices
-        self._voices = [Voice(i) for i in range(self.max_voices)]
 
     on_voice_press: Callable[[Voice], None] = None
     """The callback method to be called when a voice is pressed. Must have 1 parameter for the
@@ -798,11 +2357,13 @@ class Keyboard:
     release(keynum, notenum):`.
     """
 
-    _keys: tuple[Key] = None
+    _keys: tuple[Key] | KeyScanner = None
 
     @property
-    def keys(self) -> tuple[Key]:
-        """The :class:`Key` objects which will be used to update the keyboard state."""
+    def keys(self) -> tuple[Key] | KeyScanner:
+        """The :class:`Key` objects or :class:`KeyScanner` object which will be used to update the
+        keyboard state.
+        """
         return self._keys
 
     _arpeggiator: Arpeggiator = None
@@ -818,10 +2379,17 @@ class Keyboard:
             self._arpeggiator.on_enabled = None
             self._arpeggiator.on_press = None
             self._arpeggiator.on_release = None
+            if self._pool is not None and self._arpeggiator.pool is self._pool:
+                self._arpeggiator.pool = None
+            self._arpeggiator._set_fixed_point(0)
         self._arpeggiator = value
+        self._arpeggiator._set_fixed_point(self._fixed_point)
+        if self._arpeggiator.pool is None:
+            self._arpeggiator.pool = self._pool
         self._arpeggiator.on_enabled = self._timer_enabled
         self._arpeggiator.on_press = self._timer_press
         self._arpeggiator.on_release = self._timer_release
+        self._arpeggiator.notes = self.all_notes
 
     _mode: int = KeyboardMode.HIGH
 
@@ -835,9 +2403,9 @@ class Keyboard:
     @mode.setter
     def mode(self, value: int) -> None:
         self._mode = value % 3
+        self._sort_notes()
 
     _sustain: bool = False
-    _sustained: list[Note] = []
 
     @property
     def sustain(self) -> bool:
@@ -850,25 +2418,203 @@ class Keyboard:
     def sustain(self, value: bool) -> None:
         if value != self._sustain:
             self._sustain = value
-            self._sustained = self._notes.copy() if self._sustain else []
+            if self._sustain:
+                for notenum in self._note_flags:
+                    self._note_flags[notenum] |= _NOTE_SUSTAINED
+            else:
+                for notenum in list(self._note_flags):
+                    if self._note_flags[notenum] & _NOTE_HELD:
+                        self._note_flags[notenum] &= ~_NOTE_SUSTAINED
+                    else:
+                        self._delete_note(notenum)
             self._update()
 
-    _notes: list[Note] = []
+    _pool: NotePool = None
+    _pool_headroom: int = None
+
+    @property
+    def pool(self) -> NotePool:
+        """The :class:`NotePool` used to allocate :class:`Note` objects if it has been enabled by
+        :attr:`pool_headroom`, otherwise `None`.
+        """
+        return self._pool
+
+    @property
+    def pool_headroom(self) -> int:
+        """The number of :class:`Note` objects to preallocate in the :attr:`pool` in addition to
+        :attr:`max_voices`. The size of the pool is automatically updated whenever
+        :attr:`max_voices` is changed. When set as `None` (the default), the pool is disabled and
+        new :class:`Note` objects will be allocated for each note event.
+        """
+        return self._pool_headroom
+
+    @pool_headroom.setter
+    def pool_headroom(self, value: int) -> None:
+        self._pool_headroom = max(value, 0) if value is not None else None
+        if self._pool_headroom is None:
+            if self._arpeggiator and self._arpeggiator.pool is self._pool:
+                self._arpeggiator.pool = None
+            self._pool = None
+            return
+        if self._pool is None:
+            self._pool = NotePool(0)
+            if self._arpeggiator and self._arpeggiator.pool is None:
+                self._arpeggiator.pool = self._pool
+        self._pool.size = self._max_voices + self._pool_headroom
+
+    _velocity_curve: int | tuple[float] = VelocityCurve.LINEAR
+    _velocity_table: list[float] = None
+
+    @property
+    def velocity_curve(self) -> int | tuple[float]:
+        """The curve used to map the velocity of notes added with :meth:`append`. Use one of the
+        constants of :class:`VelocityCurve` or a custom sequence of at least 2 velocities (0.0-1.0)
+        which will be interpolated evenly across the full range of velocity. The curve is compiled
+        into a lookup table when set. Velocity is not mapped when a :class:`Note` object is appended
+        directly. Defaults to :const:`VelocityCurve.LINEAR`.
+        """
+        return self._velocity_curve
+
+    @velocity_curve.setter
+    def velocity_curve(self, value: int | tuple[float]) -> None:
+        self._velocity_table = _compile_velocity_curve(value, self._fixed_point)
+        self._velocity_curve = value
+
+    _fixed_point: int = 0
+    _ticks: int = 0
+
+    @property
+    def fixed_point(self) -> int:
+        """The number of bits used to represent the velocity of notes as integers, either 7 or 16.
+        When enabled, the timestamps of notes and voices are taken from an integer counter which is
+        incremented at each event rather than :func:`time.monotonic`, avoiding float math on boards
+        without an FPU while preserving the order of :const:`KeyboardMode.LAST` and
+        :attr:`active_voices`. Integer velocities passed to :meth:`append` are used directly and
+        float velocities (0.0-1.0) are converted. Any other value will be rounded up to 7 or 16
+        bits. Set as 0 (the default) to use float velocities and timestamps.
+        """
+        return self._fixed_point
+
+    @fixed_point.setter
+    def fixed_point(self, value: int) -> None:
+        value = 0 if value <= 0 else (7 if value <= 7 else 16)
+        previous, self._fixed_point = self._fixed_point, value
+        self._timestamp = self._next_tick if value else time.monotonic
+
+        # Convert current notes and voices while retaining their order
+        for note in self.all_notes:
+            note.velocity = self._convert_velocity(note.velocity, previous)
+            note.timestamp = self._timestamp()
+        self._timer_note.velocity = self._convert_velocity(self._timer_note.velocity, previous)
+        if self._arpeggiator:
+            for notes in self._arpeggiator._octave_notes:
+                for note in notes:
+                    note.velocity = self._convert_velocity(note.velocity, previous)
+            self._arpeggiator._set_fixed_point(value)
+        for voice in sorted(self._voices, key=lambda voice: (voice.time, voice.index)):
+            voice.time = self._timestamp()
+        self._velocity_table = _compile_velocity_curve(self._velocity_curve, value)
+
+    def _next_tick(self) -> int:
+        self._ticks += 1
+        return self._ticks
+
+    def _convert_velocity(self, velocity: float | int, bits: int = 0) -> float | int:
+        if bits:
+            velocity /= (1 << bits) - 1
+        if self._fixed_point:
+            velocity = int(velocity * ((1 << self._fixed_point) - 1) + 0.5)
+        return velocity
+
+    def _new_note(self, notenum: int, velocity: float = 1.0, keynum: int = None) -> Note:
+        if not self._fixed_point:
+            if self._velocity_table is not None:
+                velocity = _map_velocity(self._velocity_table, velocity)
+            if self._pool is not None:
+                return self._pool.acquire(notenum, velocity, keynum)
+            return Note(notenum, velocity, keynum)
+
+        if type(velocity) is not int:
+            velocity = self._convert_velocity(velocity)
+        if self._velocity_table is not None:
+            velocity = self._velocity_table[velocity >> (self._fixed_point - 7)]
+        if self._pool is not None:
+            return self._pool.acquire(notenum, velocity, keynum, self._next_tick())
+        note = Note(notenum, velocity, keynum)
+        note.timestamp = self._next_tick()
+        return note
+
+    def _recycle_note(self, note: Note) -> None:
+        # Notes are only recycled once they are no longer assigned to a voice
+        voice = self._voice_map.get(note.notenum)
+        if voice is None or voice.note is not note:
+            self._pool.release(note)
+
+    _note_index: dict[int, Note] = None
+    _note_flags: dict[int, int] = None
+    _sorted_notes: list[Note] = None
 
     @property
     def all_notes(self) -> list[Note]:
-        """All active :class:`Note` objects."""
-        return self._notes + self._sustained
+        """All active :class:`Note` objects, both held and sustained, ordered by the time at which
+        they were played.
+        """
+        if self._mode == KeyboardMode.LAST:
+            return self._sorted_notes.copy()
+        notes = list(self._note_index.values())
+        notes.sort(key=lambda note: note.timestamp)
+        return notes
 
     @property
     def notes(self) -> list[Note]:
         """Active :class:`Notes` objects according to the current :class:`KeyboardMode`."""
-        notes = self.all_notes
-        if self._mode in {KeyboardMode.HIGH, KeyboardMode.LOW}:
-            notes.sort(reverse=(self._mode == KeyboardMode.HIGH))
-        else:  # KeyboardMode.LAST
+        if self._mode == KeyboardMode.HIGH:
+            return self._sorted_notes[: -self._max_voices - 1 : -1]
+        else:  # KeyboardMode.LOW, KeyboardMode.LAST
+            return self._sorted_notes[: self._max_voices]
+
+    def _sort_notes(self) -> None:
+        # Rebuild the priority buffer once whenever the keyboard mode changes
+        notes = list(self._note_index.values())
+        if self._mode == KeyboardMode.LAST:
             notes.sort(key=lambda note: note.timestamp)
-        return notes[: self._max_voices]
+        else:  # KeyboardMode.HIGH, KeyboardMode.LOW
+            notes.sort(key=lambda note: note.notenum)
+        self._sorted_notes = notes
+
+    def _find_sorted_note(self, note: Note) -> int:
+        # Binary search for the insertion point after any notes of equal priority
+        notes = self._sorted_notes
+        lo, hi = 0, len(notes)
+        if self._mode == KeyboardMode.LAST:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if note.timestamp < notes[mid].timestamp:
+                    hi = mid
+                else:
+                    lo = mid + 1
+        else:  # KeyboardMode.HIGH, KeyboardMode.LOW
+            lo = _bisect_notes(notes, note.notenum)
+        return lo
+
+    def _insert_sorted_note(self, note: Note) -> None:
+        self._sorted_notes.insert(self._find_sorted_note(note), note)
+
+    def _remove_sorted_note(self, note: Note) -> None:
+        i = self._find_sorted_note(note) - 1
+        while self._sorted_notes[i] is not note:
+            i -= 1
+        del self._sorted_notes[i]
+
+    def _delete_note(self, notenum: int) -> None:
+        note = self._note_index.pop(notenum)
+        if self._note_flags.pop(notenum) & _NOTE_POOLED:
+            self._recycled.append(note)
+        self._remove_sorted_note(note)
+        if self._stealing:
+            self._removed_notes.append(note)
+        if self._arpeggiator:
+            self._arpeggiator.remove(note)
 
     def append(self, notenum: int | Note, velocity: float = 1.0, keynum: int = None):
         """Add a note to the keyboard buffer. Useful when working with MIDI input or another note
@@ -882,13 +2628,29 @@ class Keyboard:
         :param keynum: An additional index reference typically used to associate the note with a
             physical :class:`Key` object. Not required for use of the keyboard.
         """
-        self.remove(notenum, True)
-        note = notenum if isinstance(notenum, Note) else Note(notenum, velocity, keynum)
-        self._notes.append(note)
-        if self._sustain:
-            self._sustained.append(note)
+        self._append_note(notenum, velocity, keynum)
         self._update()
 
+    def _append_note(self, notenum: int | Note, velocity: float = 1.0, keynum: int = None) -> None:
+        flags = _NOTE_HELD | _NOTE_SUSTAINED if self._sustain else _NOTE_HELD
+        if isinstance(notenum, Note):
+            note = notenum
+            if self._fixed_point:
+                note.timestamp = self._next_tick()
+        else:
+            note = self._new_note(notenum, velocity, keynum)
+            if self._pool is not None:
+                flags |= _NOTE_POOLED
+        if note.notenum in self._note_flags:
+            self._release_note(note.notenum, True)
+        self._note_index[note.notenum] = note
+        self._note_flags[note.notenum] = flags
+        self._insert_sorted_note(note)
+        if self._stealing:
+            self._pending_notes.append(note)
+        if self._arpeggiator:
+            self._arpeggiator.append(note)
+
     def remove(self, notenum: int | Note, remove_sustained: bool = False):
         """Remove a note from the keyboard buffer. Useful when working with MIDI input or another
         note source. If the note is found (and the keyboard isn't being sustained or
@@ -901,55 +2663,159 @@ class Keyboard:
         :param remove_sustained: Whether or not you would like to override the current sustained
             state of the keyboard and release any notes that are being sustained.
         """
-        if not notenum in self.all_notes:
+        if isinstance(notenum, Note):
+            notenum = notenum.notenum
+        if not notenum in self._note_flags:
             return
-        self._notes = [note for note in self._notes if note != notenum]
-        if remove_sustained and self._sustain and self._sustained:
-            self._sustained = [note for note in self._sustained if note != notenum]
+        self._release_note(notenum, remove_sustained)
+        self._update()
+
+    def apply_events(self, events: list[tuple[int, int, float]]) -> None:
+        """Apply a batch of note events to the keyboard buffer, such as a chord or a buffer of MIDI
+        messages. Voices are only allocated once all events have been applied, so only the net
+        changes will trigger voice callbacks.
+
+        :param events: A sequence of events formatted as (type:int, notenum:int, velocity:float),
+            where type is either :const:`KeyState.PRESS` or :const:`KeyState.RELEASE`. The velocity
+            of release events is ignored.
+        """
+        for state, notenum, velocity in events:
+            if state == KeyState.PRESS:
+                self._append_note(notenum, velocity)
+            elif state == KeyState.RELEASE and notenum in self._note_flags:
+                self._release_note(notenum, False)
+        self._update()
+
+    def remove_all(self, remove_sustained: bool = False) -> None:
+        """Remove all notes from the keyboard buffer, such as when an "all notes off" message is
+        received. Voices are only updated once after all notes have been removed.
+
+        :param remove_sustained: Whether or not you would like to override the current sustained
+            state of the keyboard and release any notes that are being sustained.
+        """
+        for notenum in list(self._note_flags):
+            self._release_note(notenum, remove_sustained)
         self._update()
 
+    def _release_note(self, notenum: int, remove_sustained: bool) -> None:
+        flags = self._note_flags[notenum] & ~_NOTE_HELD
+        if remove_sustained:
+            flags &= ~_NOTE_SUSTAINED
+        if flags & (_NOTE_HELD | _NOTE_SUSTAINED):
+            self._note_flags[notenum] = flags
+        else:
+            self._delete_note(notenum)
+
     async def update(self, delay: float = 0.01) -> None:
-        """Update :attr:`keys` objects if they were provided during initialization.
+        """Update :attr:`keys` objects if they were provided during initialization. If a
+        :class:`KeyScanner` object was provided, all keys are read in a single scan and only the
+        keys which have changed state are processed.
 
         :param delay: The amount of time to sleep between polling in seconds.
         """
         while self._keys:
-            for i in range(len(self._keys)):
-                state = self._keys[i].state
-                if state == KeyState.NONE:
-                    continue
-                notenum = self.root + i
-                if state == KeyState.PRESS:
-                    velocity = self._keys[i].velocity
-                    self.append(notenum, velocity, i)
-                    if callable(self.on_key_press):
-                        self.on_key_press(i, notenum, velocity)
-                else:  # KeyState.RELEASE
-                    self.remove(notenum)
-                    if callable(self.on_key_release):
-                        self.on_key_release(i, notenum)
+            if isinstance(self._keys, KeyScanner):
+                with self:
+                    for i, state in self._keys.changes():
+                        if state == KeyState.PRESS:
+                            self._press_key(i, self._keys.velocity(i))
+                        else:  # KeyState.RELEASE
+                            self._release_key(i)
+            else:
+                for i in range(len(self._keys)):
+                    state = self._keys[i].state
+                    if state == KeyState.PRESS:
+                        self._press_key(i, self._keys[i].velocity)
+                    elif state == KeyState.RELEASE:
+                        self._release_key(i)
             await asyncio.sleep(delay)
 
+    def _press_key(self, keynum: int, velocity: float) -> None:
+        notenum = self.root + keynum
+        self.append(notenum, velocity, keynum)
+        if callable(self.on_key_press):
+            self.on_key_press(keynum, notenum, velocity)
+
+    def _release_key(self, keynum: int) -> None:
+        notenum = self.root + keynum
+        self.remove(notenum)
+        if callable(self.on_key_release):
+            self.on_key_release(keynum, notenum)
+
+    _defer_depth: int = 0
+    _deferred: bool = False
+
+    def begin(self) -> None:
+        """Defer voice allocation until :meth:`commit` is called. Any changes to the notes, sustain
+        or voices of the keyboard in the meantime are coalesced so that only the net voice changes
+        trigger callbacks when committed. Calls may be nested, in which case voices are only
+        allocated by the outermost :meth:`commit`. The keyboard can also be used as a context
+        manager, ie: :code:`with keyboard:`.
+        """
+        self._defer_depth += 1
+
+    def commit(self) -> None:
+        """Allocate voices for all changes made since :meth:`begin` was called."""
+        if not self._defer_depth:
+            return
+        self._defer_depth -= 1
+        if not self._defer_depth and self._deferred:
+            self._deferred = False
+            self._update()
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.commit()
+
     def _update(self) -> None:
+        if self._defer_depth:
+            self._deferred = True
+            return
         if not self._arpeggiator or not self._arpeggiator.active:
-            self._update_voices(self.notes)
-        else:
-            self._arpeggiator.notes = self.all_notes
+            self._update_voices(self._pending_notes if self._stealing else self.notes)
+        elif self._stealing:
+            self._pending_notes.clear()
+            self._removed_notes.clear()
+        if self._recycled:
+            for note in self._recycled:
+                self._recycle_note(note)
+            self._recycled.clear()
 
     # Callbacks for arpeggiator
     def _timer_enabled(self, active: bool) -> None:
         if active:
-            self.arpeggiator.notes = self.all_notes
+            self._update_voices()
         else:
-            self.update()
+            if self._stealing:
+                self._queue_notes()
+            self._update()
 
     def _timer_press(self, notenum: int, velocity: float) -> None:
-        self._update_voices([Note(notenum, velocity)])
-
-    def _timer_release(self, notenum: int) -> None:  # NOTE: notenum is ignored
-        self._update_voices()
-
-    _voices: list[Voice] = []
+        # Release any remaining voices before the step note is reused
+        while self._active_voices:
+            self._release_voice(self._active_voices[0])
+        note = self._timer_note
+        note.notenum = notenum
+        note.velocity = velocity
+        if self._fixed_point and type(velocity) is not int:
+            note.velocity = self._convert_velocity(velocity)
+        note.timestamp = self._timestamp()
+        voice = self._next_voice()
+        if voice is not None:
+            self._press_voice(voice, note)
+
+    def _timer_release(self, notenum: int) -> None:
+        voice = self._voice_map.get(notenum)
+        if voice is not None and voice.note is self._timer_note:
+            self._release_voice(voice)
+
+    _voices: list[Voice] = None
+    _voice_map: dict[int, Voice] = None
+    _active_voices: list[Voice] = None
+    _inactive_voices: list[Voice] = None
 
     @property
     def voices(self) -> list[Voice]:
@@ -962,31 +2828,39 @@ class Keyboard:
     def max_voices(self) -> int:
         """The maximum number of voices used by this keyboard to allocate notes. Must be greater
         than 1. When this property is set, it will automatically release and delete any voices or
-        add new voice objects depending on the previous number of voices. Any voice related
-        callbacks may be triggered during this process.
+        add new voice objects depending on the previous number of voices, then reallocate the
+        current notes to the remaining voices. Any voice related callbacks may be triggered during
+        this process.
         """
         return self._max_voices
 
     @max_voices.setter
     def max_voices(self, value: int) -> None:
         self._max_voices = max(value, 1)
+        if self._pool is not None:
+            self._pool.size = self._max_voices + self._pool_headroom
         if len(self._voices) > self._max_voices:
             for i in range(len(self._voices) - 1, self._max_voices - 1, -1):
-                self._release_voice(self._voices[i])
+                voice = self._voices[i]
+                self._release_voice(voice)
+                self._inactive_voices.remove(voice)
                 del self._voices[i]
         elif len(self._voices) < self._max_voices:
             for i in range(len(self._voices), self._max_voices):
-                self._voices.append(Voice(i))
-        self._update_voices()
+                voice = Voice(i)
+                voice.time = self._timestamp()
+                self._voices.append(voice)
+                self._insert_voice(self._inactive_voices, voice)
+        if self._stealing:
+            self._queue_notes()
+        self._update()
 
     @property
     def active_voices(self) -> list[Voice]:
         """All keyboard voices that are "active", have been assigned a note. The voices will
         automatically be sorted by the time they were last assigned a note from oldest to newest.
         """
-        voices = [voice for voice in self._voices if voice.active]
-        voices.sort(key=lambda voice: voice.time)
-        return voices
+        return self._active_voices.copy()
 
     @property
     def inactive_voices(self) -> list[Voice]:
@@ -994,45 +2868,206 @@ class Keyboard:
         voices will automatically be sorted by the time they were last assigned a note from oldest
         to newest.
         """
-        voices = [voice for voice in self._voices if not voice.active]
-        voices.sort(key=lambda voice: voice.time)
-        return voices
+        return self._inactive_voices.copy()
+
+    def _insert_voice(self, voices: list[Voice], voice: Voice) -> None:
+        # Keep voices ordered by time (then index), searching from the newest end
+        i = len(voices)
+        while i > 0 and (
+            voices[i - 1].time > voice.time
+            or (voices[i - 1].time == voice.time and voices[i - 1].index > voice.index)
+        ):
+            i -= 1
+        voices.insert(i, voice)
+
+    _stealing: int = VoiceStealing.NONE
+
+    @property
+    def stealing(self) -> int:
+        """The policy used to steal voices as a constant value of :class:`VoiceStealing`. When
+        enabled, every new note is assigned a voice as it is played, regardless of
+        :attr:`mode`, and a voice is stolen if none are available. A note which has had its voice
+        stolen will not be played again until it is pressed again. Active voices are kept in a
+        priority heap so that each voice can be stolen in O(log n) time, and only the notes which
+        have been played or removed since the last update are handled. Defaults to
+        :const:`VoiceStealing.NONE`.
+        """
+        return self._stealing
+
+    @stealing.setter
+    def stealing(self, value: int) -> None:
+        self._stealing = value % 6
+        self._heap.clear()
+        self._heap_positions.clear()
+        self._pending_notes.clear()
+        self._removed_notes.clear()
+        if self._stealing:
+            for voice in self._active_voices:
+                self._heap_push(voice)
+            self._queue_notes()
+        self._update()
+
+    _pending_notes: list[Note] = None
+    _removed_notes: list[Note] = None
+
+    def _queue_notes(self) -> None:
+        # Queue all notes to be allocated voices in the order they were played
+        self._pending_notes = self.all_notes
+        self._removed_notes.clear()
+
+    def _steals_before(self, a: Voice, b: Voice) -> bool:
+        # Whether voice a should be stolen before voice b, ties are broken by age
+        if self._stealing == VoiceStealing.QUIETEST and a._note.velocity != b._note.velocity:
+            return a._note.velocity < b._note.velocity
+        elif self._stealing == VoiceStealing.HIGHEST and a._note.notenum != b._note.notenum:
+            return a._note.notenum > b._note.notenum
+        elif self._stealing == VoiceStealing.LOWEST and a._note.notenum != b._note.notenum:
+            return a._note.notenum < b._note.notenum
+        return a.time < b.time
+
+    def _heap_push(self, voice: Voice) -> None:
+        self._heap.append(voice)
+        self._heap_sift_up(len(self._heap) - 1)
+
+    def _heap_remove(self, voice: Voice) -> None:
+        i = self._heap_positions.pop(voice.index)
+        last = self._heap.pop()
+        if last is not voice:
+            self._heap[i] = last
+            self._heap_sift_up(i)
+            self._heap_sift_down(self._heap_positions[last.index])
+
+    def _heap_sift_up(self, i: int) -> None:
+        heap, voice = self._heap, self._heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._steals_before(voice, heap[parent]):
+                break
+            heap[i] = heap[parent]
+            self._heap_positions[heap[i].index] = i
+            i = parent
+        heap[i] = voice
+        self._heap_positions[voice.index] = i
+
+    def _heap_sift_down(self, i: int) -> None:
+        heap, voice = self._heap, self._heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= len(heap):
+                break
+            if child + 1 < len(heap) and self._steals_before(heap[child + 1], heap[child]):
+                child += 1
+            if not self._steals_before(heap[child], voice):
+                break
+            heap[i] = heap[child]
+            self._heap_positions[heap[i].index] = i
+            i = child
+        heap[i] = voice
+        self._heap_positions[voice.index] = i
+
+    def _victim_voice(self) -> Voice:
+        # Get the voice which should be stolen next, or None if no voices are active
+        if self._stealing:
+            return self._heap[0] if self._heap else None
+        return self._active_voices[0] if self._active_voices else None
+
+    def _steal_voice(self, voice: Voice) -> None:
+        note = voice._note
+        if self._stealing and self._note_index.get(note.notenum) is note:
+            self._note_flags[note.notenum] |= _NOTE_STOLEN
+        self._release_voice(voice)
 
     def _update_voices(self, notes: list[Note] = None) -> None:
+        # Only the notes which have been appended or removed are handled while stealing
+        if self._stealing and notes is not None:
+            self._update_stolen_voices(notes)
+            return
+
         # Release all active voices if no available notes
-        if notes is None or not notes:
-            if voices := self.active_voices:
-                for voice in voices:
-                    self._release_voice(voice)
+        if not notes:
+            while self._active_voices:
+                self._release_voice(self._active_voices[0])
             return
 
-        if voices := self.active_voices:
-            for voice in voices:
-                # Determine if voice has one of the notes in the buffer
-                has_note = False
-                for note in notes:
-                    if voice.note is note:
-                        has_note = True
-                        break
-                if not has_note:
-                    # Release voices without active notes
-                    self._release_voice(voice)
+        # Determine which notes are already assigned to a voice
+        assigned = set()
+        for note in notes:
+            voice = self._voice_map.get(note.notenum)
+            if voice is not None and voice.note is note:
+                assigned.add(note.notenum)
+
+        # Release voices without active notes
+        if len(assigned) < len(self._active_voices):
+            i = 0
+            while i < len(self._active_voices):
+                voice = self._active_voices[i]
+                if voice.note.notenum in assigned:
+                    i += 1
                 else:
-                    # Remove currently active notes from buffer
-                    notes.remove(voice.note)
+                    self._release_voice(voice)
 
         # Activate new notes
         # If no voices are available, it will ignore remaining notes
-        if notes and (voices := self.inactive_voices):
-            voice_index = 0
-            for note in notes:
-                self._press_voice(voices[voice_index], note)
-                voice_index += 1
-                if voice_index >= len(voices):
+        for note in notes:
+            if note.notenum not in assigned:
+                voice = self._next_voice()
+                if voice is None:
                     break
+                self._press_voice(voice, note)
+
+    def _update_stolen_voices(self, notes: list[Note]) -> None:
+        # Release voices of removed notes, unless the same note value will be retriggered
+        retrigger = self._stealing == VoiceStealing.RETRIGGER
+        for note in self._removed_notes:
+            voice = self._voice_map.get(note.notenum)
+            if (
+                voice is not None
+                and voice._note is note
+                and not (retrigger and note.notenum in self._note_index)
+            ):
+                self._release_voice(voice)
+        self._removed_notes.clear()
+
+        # Activate new notes in the order they were played, stealing voices if none are available.
+        # Any notes which can't be allocated a voice are kept until the next update.
+        i = 0
+        while i < len(notes):
+            note = notes[i]
+            if (
+                self._note_index.get(note.notenum) is not note
+                or self._note_flags[note.notenum] & _NOTE_STOLEN
+            ):
+                i += 1
+                continue
+            voice = self._voice_map.get(note.notenum)
+            if voice is not None:
+                if voice._note is note:
+                    i += 1
+                    continue
+                self._release_voice(voice)
+            else:
+                voice = self._next_voice()
+                if voice is None:
+                    voice = self._victim_voice()
+                    if voice is None:
+                        break
+                    self._steal_voice(voice)
+            self._press_voice(voice, note)
+            i += 1
+        del notes[:i]
+
+    def _next_voice(self) -> Voice:
+        # Get the voice which should be used to play a new note, or None if unavailable
+        return self._inactive_voices[0] if self._inactive_voices else None
 
     def _press_voice(self, voice: Voice, note: Note) -> None:
-        voice.note = note
+        voice._note = note
+        voice.time = self._timestamp()
+        self._inactive_voices.remove(voice)
+        self._insert_voice(self._active_voices, voice)
+        self._voice_map[note.notenum] = voice
+        if self._stealing:
+            self._heap_push(voice)
         if callable(self.on_voice_press):
             self.on_voice_press(voice)
 
@@ -1043,4 +3078,373 @@ class Keyboard:
         elif voice.active:
             if callable(self.on_voice_release):
                 self.on_voice_release(voice)
+            if self._voice_map.get(voice.note.notenum) is voice:
+                del self._voice_map[voice.note.notenum]
+            if self._stealing:
+                self._heap_remove(voice)
             voice.note = None
+            self._active_voices.remove(voice)
+            self._insert_voice(self._inactive_voices, voice)
+
+
+class KeyboardPart(Keyboard):
+    """A single part of a :class:`MultiKeyboard` object. Each part manages its own notes, mode,
+    sustain and arpeggiator in the same manner as :class:`Keyboard`, but plays them using voices
+    shared with all other parts. When fewer shared voices are available to a part than it has
+    notes, the notes which are played are still chosen by its :class:`KeyboardMode`. These objects
+    are created by :class:`MultiKeyboard` and shouldn't be instantiated directly.
+
+    :param owner: The :class:`MultiKeyboard` object which owns the shared voices.
+    :param index: The position of the part within the :class:`MultiKeyboard` object.
+    :param max_voices: The maximum number of shared voices this part can use at once.
+    :param mode: The note allocation mode as specified by :class:`KeyboardMode` constants.
+    """
+
+    def __init__(
+        self,
+        owner: "MultiKeyboard",
+        index: int,
+        max_voices: int = 1,
+        mode: int = KeyboardMode.HIGH,
+    ):
+        self._owner = owner
+        self._index = index
+        Keyboard.__init__(self, max_voices=max_voices, mode=mode)
+        self._voices = owner._voices
+        self._inactive_voices = owner._inactive_voices
+
+    @property
+    def index(self) -> int:
+        """The position of the part within the :class:`MultiKeyboard` object."""
+        return self._index
+
+    @property
+    def max_voices(self) -> int:
+        """The maximum number of shared voices which this part can use at once. Cannot be greater
+        than the total number of voices of the :class:`MultiKeyboard` object.
+        """
+        return self._max_voices
+
+    @max_voices.setter
+    def max_voices(self, value: int) -> None:
+        available, reserved = len(self._inactive_voices), self._reserved
+        self._max_voices = min(max(value, 1), len(self._owner._voices))
+        if self._pool is not None:
+            self._pool.size = self._max_voices + self._pool_headroom
+        if self._stealing:
+            # Steal any voices beyond the new limit before resyncing
+            while len(self._active_voices) > self._max_voices:
+                self._steal_voice(self._victim_voice())
+            self._queue_notes()
+        self._reserved = min(self._reserved, self._max_voices)
+        self._update()
+        if self._reserved < reserved or len(self._inactive_voices) > available:
+            self._owner._rebalance(self)
+
+    _reserved: int = 0
+
+    @property
+    def reserved(self) -> int:
+        """The number of shared voices held in reserve for this part. Other parts can't use these
+        voices while they are inactive and won't steal them while they are in use by this part.
+        Defaults to 0.
+        """
+        return self._reserved
+
+    @reserved.setter
+    def reserved(self, value: int) -> None:
+        self._reserved = min(max(value, 0), self._max_voices)
+
+    priority: int = 0
+    """The stealing priority of this part. When no shared voices are available, a part can steal
+    the oldest voice of a part with a lower priority which is using more voices than it has
+    reserved. Defaults to 0.
+    """
+
+    def _next_tick(self) -> int:
+        return self._owner._next_tick()
+
+    def _next_voice(self) -> Voice:
+        if len(self._active_voices) >= self._max_voices:
+            return None
+
+        # Use an inactive voice if one isn't being held in reserve for another part, voices
+        # released by this part during an update can always be reused
+        reserved = 0
+        for part in self._owner._parts:
+            if part is not self:
+                reserved += max(part._reserved - len(part._active_voices), 0)
+        if self._inactive_voices and (
+            len(self._inactive_voices) > reserved or len(self._active_voices) < self._held
+        ):
+            return self._inactive_voices[0]
+
+        # Steal from the lowest priority part, any priority is allowed if within reserve
+        target = None
+        for part in self._owner._parts:
+            if (
+                part is not self
+                and len(part._active_voices) > part._reserved
+                and (part.priority < self.priority or len(self._active_voices) < self._reserved)
+                and (target is None or part.priority < target.priority)
+            ):
+                target = part
+        if target is None:
+            return None
+        voice = target._victim_voice()
+        target._steal_voice(voice)
+        return voice
+
+    def _capacity(self) -> int:
+        # Count the voices this part could play at once: its own voices, any inactive voices not
+        # held in reserve for another part, and any voices it is allowed to steal
+        reserved = lower = other = 0
+        for part in self._owner._parts:
+            if part is not self:
+                reserved += max(part._reserved - len(part._active_voices), 0)
+                if part.priority < self.priority:
+                    lower += max(len(part._active_voices) - part._reserved, 0)
+                else:
+                    other += max(len(part._active_voices) - part._reserved, 0)
+        capacity = len(self._active_voices) + max(len(self._inactive_voices) - reserved, 0) + lower
+        if capacity < self._reserved:
+            capacity += min(self._reserved - capacity, other)
+        return min(capacity, self._max_voices)
+
+    _held: int = 0
+
+    def _update_voices(self, notes: list[Note] = None) -> None:
+        available = len(self._inactive_voices)
+        if notes and not self._stealing:
+            # Limit notes to the voices which can be obtained so that the keyboard mode decides
+            # which notes are played
+            notes = notes[: self._capacity()]
+            self._held = len(self._active_voices)
+        Keyboard._update_voices(self, notes)
+        self._held = 0
+        if len(self._inactive_voices) > available:
+            self._owner._rebalance(self)
+
+
+class MultiKeyboard:
+    """Manage multiple :class:`KeyboardPart` objects, such as one per MIDI channel, which share a
+    single set of voices. Each part can be limited to a number of voices, hold voices in reserve,
+    and steal voices from parts of a lower priority. Whenever voices are released by one part,
+    they are reassigned to any other parts with notes waiting for a voice.
+
+    :param parts: The number of parts.
+    :param max_voices: The total number of voices shared by all parts.
+    :param mode: The note allocation mode of each part as specified by :class:`KeyboardMode`
+        constants.
+    """
+
+    def __init__(self, parts: int = 16, max_voices: int = 8, mode: int = KeyboardMode.HIGH):
+        self._voices = [Voice(i) for i in range(max(max_voices, 1))]
+        self._inactive_voices = self._voices.copy()
+        self._parts = tuple(KeyboardPart(self, i, len(self._voices), mode) for i in range(parts))
+
+    @property
+    def parts(self) -> tuple[KeyboardPart]:
+        """The :class:`KeyboardPart` objects of this keyboard."""
+        return self._parts
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def __getitem__(self, index: int) -> KeyboardPart:
+        return self._parts[index]
+
+    @property
+    def voices(self) -> list[Voice]:
+        """The :class:`Voice` objects shared by all parts."""
+        return self._voices
+
+    @property
+    def max_voices(self) -> int:
+        """The total number of voices shared by all parts."""
+        return len(self._voices)
+
+    @property
+    def active_voices(self) -> list[Voice]:
+        """All shared voices that are currently assigned a note by any part."""
+        return [voice for voice in self._voices if voice.active]
+
+    @property
+    def inactive_voices(self) -> list[Voice]:
+        """All shared voices that do not currently have a note assigned, sorted by the time they
+        were last assigned a note from oldest to newest.
+        """
+        return self._inactive_voices.copy()
+
+    @property
+    def fixed_point(self) -> int:
+        """The fixed-point mode of all parts. See :attr:`Keyboard.fixed_point`."""
+        return self._parts[0].fixed_point if self._parts else 0
+
+    @fixed_point.setter
+    def fixed_point(self, value: int) -> None:
+        for part in self._parts:
+            part.fixed_point = value
+
+    _ticks: int = 0
+
+    def _next_tick(self) -> int:
+        self._ticks += 1
+        return self._ticks
+
+    def begin(self) -> None:
+        """Defer voice allocation of all parts until :meth:`commit` is called. See
+        :meth:`Keyboard.begin`.
+        """
+        for part in self._parts:
+            part.begin()
+
+    def commit(self) -> None:
+        """Allocate voices for all changes made to each part since :meth:`begin` was called."""
+        for part in self._parts:
+            part.commit()
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.commit()
+
+    _rebalancing: bool = False
+
+    def _rebalance(self, source: KeyboardPart) -> None:
+        # Give released voices to the highest priority parts which are waiting for a voice
+        if self._rebalancing:
+            return
+        self._rebalancing = True
+        for part in sorted(self._parts, key=lambda part: -part.priority):
+            if not self._inactive_voices:
+                break
+            if part is not source and len(part._active_voices) < min(
+                len(part._note_index), part._max_voices
+            ):
+                part._update()
+        self._rebalancing = False
+
+
+_MIDI_NOTE_OFF = const(0x80)
+_MIDI_NOTE_ON = const(0x90)
+_MIDI_CONTROL_CHANGE = const(0xB0)
+_MIDI_PROGRAM_CHANGE = const(0xC0)
+_MIDI_CHANNEL_PRESSURE = const(0xD0)
+_MIDI_PITCH_BEND = const(0xE0)
+_MIDI_SYSTEM = const(0xF0)
+_MIDI_REALTIME = const(0xF8)
+_MIDI_SUSTAIN = const(64)
+_MIDI_ALL_NOTES_OFF = const(123)
+
+
+class MidiParser:
+    """Parse a raw MIDI byte stream and dispatch note, sustain pedal, and all notes off messages
+    directly to a :class:`Keyboard` object without allocating message objects. Running status and
+    note on messages with a velocity of 0 are handled automatically. System messages are ignored.
+
+    :param keyboard: The :class:`Keyboard` object which will receive note events. If a
+        :class:`MultiKeyboard` object is provided, messages are routed to the part matching their
+        channel.
+    :param channel: The MIDI channel (0-15) to receive messages from. Set as `None` to receive
+        messages from all channels.
+    :param size: The size of the buffer used to read from a stream in bytes.
+    """
+
+    def __init__(self, keyboard: Keyboard | MultiKeyboard, channel: int = None, size: int = 64):
+        self.keyboard = keyboard
+        self.channel = channel
+        self._buffer = bytearray(size)
+        self._status = 0
+        self._data = 0
+        self._count = 0
+
+    keyboard: Keyboard | MultiKeyboard = None
+    """The :class:`Keyboard` or :class:`MultiKeyboard` object which receives note events."""
+
+    channel: int = None
+    """The MIDI channel (0-15) to receive messages from, or `None` to receive from all channels."""
+
+    on_control_change: Callable[[int, int], None] = None
+    """The callback method to be called when a control change message other than sustain pedal or
+    all notes off is received. Must have 2 parameters for control number and value. Ie: :code:`def
+    control_change(control, value):`.
+    """
+
+    on_pitch_bend: Callable[[int], None] = None
+    """The callback method to be called when a pitch bend message is received. Must have 1
+    parameter for the 14-bit pitch bend value where 8192 is centered. Ie: :code:`def
+    pitch_bend(value):`.
+    """
+
+    def read(self, stream) -> int:
+        """Read all available bytes from a stream, such as a :class:`usb_midi.PortIn` or
+        :class:`busio.UART` object, into the internal buffer and parse them.
+
+        :param stream: Any object which supports :code:`readinto`.
+        :return: the number of bytes which were read
+        """
+        count = stream.readinto(self._buffer)
+        if not count:
+            return 0
+        self.feed(self._buffer, count)
+        return count
+
+    def feed(self, data: bytes | bytearray, length: int = None) -> None:
+        """Parse MIDI bytes from a buffer. Each message is applied to the keyboard as soon as it is
+        parsed so that notes which are pressed and released within the same buffer are still
+        played. Incomplete messages are retained until the next call.
+
+        :param data: The buffer of MIDI bytes.
+        :param length: The number of bytes within the buffer to parse. Defaults to the full length
+            of the buffer.
+        """
+        if length is None:
+            length = len(data)
+        for i in range(length):
+            byte = data[i]
+            if byte >= _MIDI_REALTIME:
+                continue  # Realtime messages don't interrupt running status
+            elif byte >= _MIDI_SYSTEM:
+                self._status = 0
+            elif byte & 0x80:
+                self._status = byte
+                self._count = 0
+            elif not self._status or _MIDI_PROGRAM_CHANGE <= self._status < _MIDI_PITCH_BEND:
+                continue  # Ignore data without status and messages with a single data byte
+            elif not self._count:
+                self._data = byte
+                self._count = 1
+            else:
+                self._count = 0
+                self._dispatch(self._status, self._data, byte)
+
+    def _dispatch(self, status: int, data1: int, data2: int) -> None:
+        if self.channel is not None and status & 0x0F != self.channel:
+            return
+        keyboard = self.keyboard
+        if isinstance(keyboard, MultiKeyboard):
+            if status & 0x0F >= len(keyboard):
+                return
+            keyboard = keyboard[status & 0x0F]
+        status &= 0xF0
+        if status == _MIDI_NOTE_ON and data2:
+            bits = keyboard.fixed_point
+            if not bits:
+                data2 /= 127
+            elif bits > 7:
+                data2 = (data2 << 9) | (data2 << 2) | (data2 >> 5)
+            keyboard.append(data1, data2)
+        elif status in (_MIDI_NOTE_ON, _MIDI_NOTE_OFF):
+            keyboard.remove(data1)
+        elif status == _MIDI_CONTROL_CHANGE:
+            if data1 == _MIDI_SUSTAIN:
+                keyboard.sustain = data2 >= 64
+            elif data1 == _MIDI_ALL_NOTES_OFF:
+                keyboard.remove_all()
+            elif callable(self.on_control_change):
+                self.on_control_change(data1, data2)
+        elif status == _MIDI_PITCH_BEND and callable(self.on_pitch_bend):
+            self.on_pitch_bend(data1 | (data2 << 7))